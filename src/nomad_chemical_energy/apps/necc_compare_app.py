@@ -78,6 +78,36 @@ necc_compare_app = App(
             align='left',
             selected=True,
         ),
+        Column(
+            quantity=f'data.summary.co_mean_fe#{schema}',
+            label='Mean CO FE',
+            unit='percent',
+            selected=False,
+        ),
+        Column(
+            quantity=f'data.summary.h2_mean_fe#{schema}',
+            label='Mean H2 FE',
+            unit='percent',
+            selected=False,
+        ),
+        Column(
+            quantity=f'data.summary.mean_cell_current#{schema}',
+            label='Mean cell current',
+            unit='mA',
+            selected=False,
+        ),
+        Column(
+            quantity=f'data.summary.mean_cell_voltage#{schema}',
+            label='Mean cell voltage',
+            unit='V',
+            selected=False,
+        ),
+        Column(
+            quantity=f'data.summary.cell_voltage_drift#{schema}',
+            label='Cell voltage drift',
+            unit='mV/hour',
+            selected=False,
+        ),
     ],
     # Dictionary of search filters that are always enabled for queries made
     # within this app. This is especially important to narrow down the
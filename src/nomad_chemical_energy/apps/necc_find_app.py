@@ -61,6 +61,21 @@ necc_find_experiments_app = App(
             'data.properties.anode.lab_id#nomad_chemical_energy.schema_packages.ce_necc_package.CE_NECC_ElectrodeRecipe': Column(
                 label='Anode ID', align='left'
             ),
+            f'data.summary.co_mean_fe#{schema}': Column(
+                label='Mean CO FE', unit='percent'
+            ),
+            f'data.summary.h2_mean_fe#{schema}': Column(
+                label='Mean H2 FE', unit='percent'
+            ),
+            f'data.summary.mean_cell_current#{schema}': Column(
+                label='Mean cell current', unit='mA'
+            ),
+            f'data.summary.mean_cell_voltage#{schema}': Column(
+                label='Mean cell voltage', unit='V'
+            ),
+            f'data.summary.cell_voltage_drift#{schema}': Column(
+                label='Cell voltage drift', unit='mV/hour'
+            ),
         },
     ),
     # Dictionary of search filters that are always enabled for queries made
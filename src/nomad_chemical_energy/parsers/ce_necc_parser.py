@@ -18,7 +18,6 @@
 
 import datetime
 
-import pandas as pd
 from baseclasses.helper.utilities import (
     create_archive,
     get_entry_id_from_file_name,
@@ -57,6 +56,9 @@ from nomad_chemical_energy.schema_packages.ce_necc_package import (
 from nomad_chemical_energy.schema_packages.file_parser.biologic_parser import (
     get_header_and_data,
 )
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    get_xlsx_sheet_names,
+)
 
 
 class ParsedExcelFile(EntryData):
@@ -83,7 +85,7 @@ class NECCXlsxParser(MatchingParser):
         )
         if not is_mainfile_super:
             return False
-        excel_sheets = pd.ExcelFile(filename).sheet_names
+        excel_sheets = get_xlsx_sheet_names(filename)
         required_sheets_v1 = [
             'Catalyst details',
             'Experimental details',
@@ -109,8 +111,7 @@ class NECCXlsxParser(MatchingParser):
         if not file.endswith('.xlsx'):
             return
 
-        xls_file = pd.ExcelFile(mainfile)
-        num_sheets = len(xls_file.sheet_names)
+        num_sheets = len(get_xlsx_sheet_names(mainfile))
         if num_sheets not in (4, 5, 8):
             return
         entry = CE_NECC_EC_GC(data_file=file)
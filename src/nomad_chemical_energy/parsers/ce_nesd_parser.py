@@ -17,6 +17,7 @@
 #
 
 import datetime
+import json
 
 import pandas as pd
 from baseclasses.helper.utilities import (
@@ -64,8 +65,12 @@ from nomad_chemical_energy.schema_packages.file_parser.biologic_parser import (
 from nomad_chemical_energy.schema_packages.file_parser.ch_instruments_txt_parser import (
     parse_chi_txt_file,
 )
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    ExcelWorkbook,
+)
 from nomad_chemical_energy.schema_packages.file_parser.nesd_metadata_excel_parser import (
     get_reference_electrode,
+    get_shared_entity_file_name,
     map_sample,
     map_setup,
 )
@@ -367,6 +372,27 @@ class CENESDMetadataExcelParser(MatchingParser):
         except ValueError:
             return value_str
 
+    def create_shared_entity(self, entry, archive, file_name, logger):
+        """
+        Creates an entity shared by the metadata excel files of several folders,
+        unless it exists already. Workbooks processed in parallel can race to create
+        the same file, so the file is created exclusively and only the workbook
+        that created it processes it.
+        """
+        from nomad.datamodel.context import ClientContext
+
+        if isinstance(archive.m_context, ClientContext):
+            return
+        if archive.m_context.raw_path_exists(file_name):
+            return
+        try:
+            with archive.m_context.raw_file(file_name, 'x') as outfile:
+                json.dump({'data': entry.m_to_dict(with_root_def=True)}, outfile)
+        except FileExistsError:
+            logger.info(f'{file_name} was created by another metadata excel file')
+            return
+        archive.m_context.process_updated_raw_file(file_name, allow_modify=False)
+
     def parse(self, mainfile: str, archive: EntryArchive, logger):
         file = mainfile.rsplit('raw/', maxsplit=1)[-1]
 
@@ -383,16 +409,24 @@ class CENESDMetadataExcelParser(MatchingParser):
         sample_entry.name = f'{folder_path}/sample'[1:]
 
         with archive.m_context.raw_file(file, 'rb') as f:
-            xls_file = pd.ExcelFile(f)
-            excel_data = pd.read_excel(xls_file, sheet_name='NESD Metadata')
+            excel_data = ExcelWorkbook(f).read_sheet('NESD Metadata')
             excel_data['Value'] = excel_data['Value'].apply(self.to_float_if_possible)
             mapping = dict(zip(excel_data.loc[:, 'Field'], excel_data.loc[:, 'Value']))
             map_setup(setup_entry, mapping)
             map_sample(sample_entry, mapping, logger)
 
+        # reference electrodes are shared by all folders with the same definition.
+        # Setups are never overwritten, so folders processed before keep their
+        # per-folder reference electrode entry, which their setup references.
         ref_electrode_file_name = f'{file}_reference_electrode.archive.json'
-        reference_electrode_entry = get_reference_electrode(mapping)
-        create_archive(reference_electrode_entry, archive, ref_electrode_file_name)
+        if not archive.m_context.raw_path_exists(ref_electrode_file_name):
+            reference_electrode_entry = get_reference_electrode(mapping)
+            ref_electrode_file_name = get_shared_entity_file_name(
+                reference_electrode_entry, 'nesd_reference_electrode'
+            )
+            self.create_shared_entity(
+                reference_electrode_entry, archive, ref_electrode_file_name, logger
+            )
         ref_electrode_entry_id = get_entry_id_from_file_name(
             ref_electrode_file_name, archive
         )
@@ -19,6 +19,7 @@
 import datetime
 import os
 import re
+import time
 
 from baseclasses.helper.utilities import (
     create_archive,
@@ -69,6 +70,62 @@ from nomad_chemical_energy.schema_packages.file_parser.biologic_parser import (
     get_header_and_data,
 )
 
+REFERENCE_CACHE_TTL = 60
+
+
+class _ReferenceResolver:
+    """
+    Resolves the samples, environments and setups referenced by the measurement
+    files of an upload with the same searches as `find_sample_by_id` and
+    `search_class`, but remembers the references found for `ttl` seconds, so the
+    files of an upload processed together search each id and class only once.
+    Misses are not remembered, an entity created in the meantime is found by the
+    next lookup.
+    """
+
+    def __init__(self, ttl=REFERENCE_CACHE_TTL):
+        self.ttl = ttl
+        self._caches = {}
+
+    def _get_cache(self, archive):
+        now = time.monotonic()
+        key = (archive.metadata.upload_id, archive.metadata.main_author.user_id)
+        cache = self._caches.get(key)
+        if cache is None or now - cache[0] >= self.ttl:
+            self._caches = {
+                key: value
+                for key, value in self._caches.items()
+                if now - value[0] < self.ttl
+            }
+            cache = (now, {}, {})
+            self._caches[key] = cache
+        return cache
+
+    def find_by_id(self, archive, lab_id):
+        if lab_id is None:
+            return None
+        _, lab_ids, _ = self._get_cache(archive)
+        if lab_id not in lab_ids:
+            reference = find_sample_by_id(archive, lab_id)
+            if reference is None:
+                return None
+            lab_ids[lab_id] = reference
+        return lab_ids[lab_id]
+
+    def find_by_class(self, archive, entry_type):
+        _, _, entry_types = self._get_cache(archive)
+        if entry_type not in entry_types:
+            entry = search_class(archive, entry_type)
+            if entry is None:
+                return None
+            entry_types[entry_type] = get_reference(
+                entry['upload_id'], entry['entry_id']
+            )
+        return entry_types[entry_type]
+
+
+_references = _ReferenceResolver()
+
 
 class ParsedBioLogicFile(EntryData):
     activity = Quantity(
@@ -192,9 +249,9 @@ class GamryParser(MatchingParser):
         sample_id = metadata.get('SAMPLEID')
         setup_id = metadata.get('ECSETUPID')
         environment_id = metadata.get('ENVIRONMENTID')
-        sample_ref = find_sample_by_id(archive, sample_id)
-        environment_ref = find_sample_by_id(archive, environment_id)
-        setup_ref = find_sample_by_id(archive, setup_id)
+        sample_ref = _references.find_by_id(archive, sample_id)
+        environment_ref = _references.find_by_id(archive, environment_id)
+        setup_ref = _references.find_by_id(archive, setup_id)
 
         label = metadata.get('TITLE', '')
         if 'OER CP' in label:
@@ -202,22 +259,15 @@ class GamryParser(MatchingParser):
             create_archive(CE_NOME_CPAnalysis(name=nickname), archive, file_name)
 
         if sample_ref is None:
-            sample = search_class(archive, 'CE_NOME_Sample')
-            if sample is not None:
-                upload_id, entry_id = sample['upload_id'], sample['entry_id']
-                sample_ref = get_reference(upload_id, entry_id)
+            sample_ref = _references.find_by_class(archive, 'CE_NOME_Sample')
 
         if environment_ref is None:
-            environment = search_class(archive, 'CE_NOME_Environment')
-            if environment is not None:
-                upload_id, entry_id = environment['upload_id'], environment['entry_id']
-                environment_ref = get_reference(upload_id, entry_id)
+            environment_ref = _references.find_by_class(archive, 'CE_NOME_Environment')
 
         if setup_ref is None:
-            setup = search_class(archive, 'CE_NOME_ElectroChemicalSetup')
-            if setup is not None:
-                upload_id, entry_id = setup['upload_id'], setup['entry_id']
-                setup_ref = get_reference(upload_id, entry_id)
+            setup_ref = _references.find_by_class(
+                archive, 'CE_NOME_ElectroChemicalSetup'
+            )
 
         refs = []
         for idx, (eid, name, measurement) in enumerate(measurements):
@@ -266,22 +316,17 @@ class CENOMEcsvParser(MatchingParser):
             entry = CE_NOME_PhaseFluorometryOxygen()
 
         archive.metadata.entry_name = os.path.basename(mainfile)
-        sample = search_class(archive, 'CE_NOME_Sample')
-        if sample is not None:
-            upload_id, entry_id = sample['upload_id'], sample['entry_id']
-            entry.samples = [
-                CompositeSystemReference(reference=get_reference(upload_id, entry_id))
-            ]
+        sample_ref = _references.find_by_class(archive, 'CE_NOME_Sample')
+        if sample_ref is not None:
+            entry.samples = [CompositeSystemReference(reference=sample_ref)]
 
-        environment = search_class(archive, 'CE_NOME_Environment')
-        if environment is not None:
-            upload_id, entry_id = environment['upload_id'], environment['entry_id']
-            entry.environment = get_reference(upload_id, entry_id)
+        environment_ref = _references.find_by_class(archive, 'CE_NOME_Environment')
+        if environment_ref is not None:
+            entry.environment = environment_ref
 
-        setup = search_class(archive, 'CE_NOME_ElectroChemicalSetup')
-        if setup is not None:
-            upload_id, entry_id = setup['upload_id'], setup['entry_id']
-            entry.setup = get_reference(upload_id, entry_id)
+        setup_ref = _references.find_by_class(archive, 'CE_NOME_ElectroChemicalSetup')
+        if setup_ref is not None:
+            entry.setup = setup_ref
 
         entry.name = f'{mainfile_split[0]} {notes}'
         entry.description = f'Notes from file name: {notes}'
@@ -379,20 +424,12 @@ class XASParser(MatchingParser):
         xas_measurement.name = measurement_name
 
         sample_id = measurement_name.split('.')[0]
-        sample_ref = find_sample_by_id(archive, sample_id)
+        sample_ref = _references.find_by_id(archive, sample_id)
+        if sample_ref is None:
+            sample_ref = _references.find_by_class(archive, 'CE_NOME_Sample')
         if sample_ref is not None:
             xas_measurement.samples = [CompositeSystemReference(reference=sample_ref)]
 
-        if not xas_measurement.samples:
-            sample = search_class(archive, 'CE_NOME_Sample')
-            if sample is not None:
-                upload_id, entry_id = sample['upload_id'], sample['entry_id']
-                xas_measurement.samples = [
-                    CompositeSystemReference(
-                        reference=get_reference(upload_id, entry_id)
-                    )
-                ]
-
         # archive.data = cam_measurements
         if xas_measurement is not None:
             file_name = f'{measurement_name}.archive.json'
@@ -498,20 +535,12 @@ class CENOMETIFParser(MatchingParser):
         tif_image.name = measurement_name
 
         sample_id = measurement_name.split('.')[0]
-        sample_ref = find_sample_by_id(archive, sample_id)
+        sample_ref = _references.find_by_id(archive, sample_id)
+        if sample_ref is None:
+            sample_ref = _references.find_by_class(archive, 'CE_NOME_Sample')
         if sample_ref is not None:
             tif_image.samples = [CompositeSystemReference(reference=sample_ref)]
 
-        if not tif_image.samples:
-            sample = search_class(archive, 'CE_NOME_Sample')
-            if sample is not None:
-                upload_id, entry_id = sample['upload_id'], sample['entry_id']
-                tif_image.samples = [
-                    CompositeSystemReference(
-                        reference=get_reference(upload_id, entry_id)
-                    )
-                ]
-
         # archive.data = cam_measurements
         if tif_image is not None:
             file_name = f'{measurement_name}.archive.json'
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import time
 
 from baseclasses.helper.utilities import (
     create_archive,
@@ -38,23 +39,6 @@ from nomad.parsing import MatchingParser
 from nomad_chemical_energy.schema_packages.hzb_catlab_package import CatLab_Sample
 
 
-def find_sample_by_id(archive, sample_id):
-    from nomad.search import search
-
-    if sample_id is None:
-        return None
-
-    query = {'results.eln.lab_ids': sample_id, 'upload_id': archive.metadata.upload_id}
-
-    search_result = search(
-        owner='all', query=query, user_id=archive.metadata.main_author.user_id
-    )
-    if len(search_result.data) > 0:
-        entry_id = search_result.data[0]['entry_id']
-        upload_id = search_result.data[0]['upload_id']
-        return get_reference(upload_id, entry_id)
-
-
 class ParsedCatlabFile(EntryData):
     # activity = Quantity(
     #     type=Activity,
@@ -67,14 +51,87 @@ class ParsedCatlabFile(EntryData):
     lab_id = Quantity(type=str)
 
 
+SAMPLE_INDEX_TTL = 60
+
+
 def search_samples_in_upload(archive):
+    """
+    Yields all CatLab samples of the upload, page by page.
+    """
+    from nomad.app.v1.models import MetadataPagination, MetadataRequired
     from nomad.search import search
 
     query = {'entry_type': 'CatLab_Sample', 'upload_id': archive.metadata.upload_id}
-    search_result = search(
-        owner='all', query=query, user_id=archive.metadata.main_author.user_id
-    )
-    return search_result
+    required = MetadataRequired()
+    required.include = [
+        'entry_id',
+        'upload_id',
+        'data.lab_id#nomad_chemical_energy.schema_packages.hzb_catlab_package.CatLab_Sample',
+        'results.eln.lab_ids',
+    ]
+    pagination = MetadataPagination()
+    pagination.page_size = 1000
+    while True:
+        search_result = search(
+            owner='all',
+            query=query,
+            pagination=pagination,
+            required=required,
+            user_id=archive.metadata.main_author.user_id,
+        )
+        yield from search_result.data
+        next_page = search_result.pagination.next_page_after_value
+        if not next_page or not search_result.data:
+            return
+        pagination.page_after_value = next_page
+
+
+class _SampleIndex:
+    """
+    Maps the lab ids of the CatLab samples of an upload to their references. The
+    index is built from one search and shared by all files processed within `ttl`
+    seconds. Samples created by the parser are added right away, so files of the
+    same sample do not depend on the search index being up to date.
+    """
+
+    def __init__(self, ttl=SAMPLE_INDEX_TTL):
+        self.ttl = ttl
+        self._indices = {}
+
+    def _get_index(self, archive):
+        now = time.monotonic()
+        upload_id = archive.metadata.upload_id
+        index = self._indices.get(upload_id)
+        if index is None or now - index[0] >= self.ttl:
+            self._indices = {
+                key: value
+                for key, value in self._indices.items()
+                if now - value[0] < self.ttl
+            }
+            samples = {}
+            for entry in search_samples_in_upload(archive):
+                lab_id = entry.get('data', {}).get('lab_id') or next(
+                    iter(entry.get('results', {}).get('eln', {}).get('lab_ids', [])),
+                    None,
+                )
+                if lab_id is not None:
+                    samples.setdefault(
+                        lab_id, get_reference(entry['upload_id'], entry['entry_id'])
+                    )
+            index = (now, samples)
+            self._indices[upload_id] = index
+        return index[1]
+
+    def get(self, archive, lab_id):
+        if lab_id is None:
+            return None
+        return self._get_index(archive).get(lab_id)
+
+    def add(self, archive, lab_id, reference):
+        self._get_index(archive)[lab_id] = reference
+
+
+_sample_index = _SampleIndex()
 
 
 class CatlabParser(MatchingParser):
@@ -82,30 +139,30 @@ class CatlabParser(MatchingParser):
         file = mainfile.rsplit('/', maxsplit=1)[-1]
 
         sample_id = file.split('#')[0]
-        results = search_samples_in_upload(archive)
-        parent = None
-        exist = False
-        for r in results.data:
-            print(r)
-            if r['data'].get('lab_id') == sample_id:
-                exist = True
-            if r['data'].get('lab_id') == '_'.join(sample_id.split('_')[:-1]):
-                parent = r['data']['lab_id']
+        parent = '_'.join(sample_id.split('_')[:-1])
+        parent_ref = _sample_index.get(archive, parent)
+        if parent_ref is None:
+            parent = None
 
         file_name = f'{sample_id}.archive.json'
-        if not exist:
+        entry_id = get_entry_id_from_file_name(file_name, archive)
+        if _sample_index.get(archive, sample_id) is None:
             entry = CatLab_Sample(
                 lab_id=sample_id,
                 name=sample_id,
                 parent=CompositeSystemReference(
                     name=parent,
-                    reference=find_sample_by_id(archive, parent),
+                    reference=parent_ref,
                     lab_id=parent,
                 ),
             )
             create_archive(entry, archive, file_name)
+            _sample_index.add(
+                archive,
+                sample_id,
+                get_reference(archive.metadata.upload_id, entry_id),
+            )
 
-        entry_id = get_entry_id_from_file_name(file_name, archive)
         archive.data = ParsedCatlabFile(
             lab_id=sample_id, sample=get_reference(archive.metadata.upload_id, entry_id)
         )
@@ -33,7 +33,8 @@ from baseclasses.chemical_energy import (
 from nomad.datamodel.data import EntryData
 from nomad.datamodel.metainfo.basesections import AnalysisResult
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
-from nomad.metainfo import Quantity, SchemaPackage, Section, SubSection
+from nomad.metainfo import MEnum, Quantity, SchemaPackage, Section, SubSection
+from nomad.units import ureg
 
 from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
     make_bode_plot,
@@ -46,6 +47,10 @@ from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
     make_nyquist_plot,
     make_voltage_plot,
 )
+from nomad_chemical_energy.schema_packages.utilities.tafel import (
+    fit_tafel_slope,
+    get_backscan,
+)
 
 m_package = SchemaPackage()
 
@@ -743,6 +748,13 @@ class CE_AMCC_ZIR(ElectrochemicalImpedanceSpectroscopyMultiple, EntryData):
         super().normalize(archive, logger)
 
 
+AMCC_STUDY_CYCLIC_VOLTAMMETRIES = (
+    'cv_activation',
+    'cv_after_activation',
+    'cv_after_testing',
+)
+
+
 class CE_AMCC_CVMetrics(AnalysisResult):
     overpotential_at_1_mA_cm2 = Quantity(
         type=np.dtype(np.float64),
@@ -764,7 +776,19 @@ class CE_AMCC_CVMetrics(AnalysisResult):
 
     tafel_slope = Quantity(
         type=np.dtype(np.float64),
-        description='Tafel slope (mV/dec) within potential range 1.5-1.53V and logarithmic scaling of current density.',
+        unit='mV',
+        description='Tafel slope per decade of current density within potential range 1.5-1.53V and logarithmic scaling of current density.',
+    )
+
+    tafel_intercept = Quantity(
+        type=np.dtype(np.float64),
+        unit='V',
+        description='Potential of the Tafel fit at a current density of 1 mA/cm².',
+    )
+
+    tafel_r_squared = Quantity(
+        type=np.dtype(np.float64),
+        description='Coefficient of determination of the Tafel fit.',
     )
 
     cycle_number = Quantity(
@@ -772,6 +796,13 @@ class CE_AMCC_CVMetrics(AnalysisResult):
         description='Cycle Number of the Cyclic Voltammetry',
     )
 
+    cyclic_voltammetry = Quantity(
+        type=MEnum(*AMCC_STUDY_CYCLIC_VOLTAMMETRIES),
+        description='Cyclic voltammetry of the study the metrics are extracted from. '
+        'Can be left empty if the study contains only one cyclic voltammetry.',
+        a_eln=dict(component='EnumEditQuantity'),
+    )
+
     study_type = Quantity(
         type=str,
         a_eln=dict(
@@ -785,6 +816,53 @@ class CE_AMCC_CVMetrics(AnalysisResult):
         ),
     )
 
+    def get_cyclic_voltammetry(self):
+        if self.cyclic_voltammetry is not None:
+            return getattr(self.m_parent, self.cyclic_voltammetry, None)
+        # without a selection the cyclic voltammetry is only unambiguous if the
+        # study has a single one
+        cvs = [
+            cv
+            for cv in (
+                getattr(self.m_parent, name, None)
+                for name in AMCC_STUDY_CYCLIC_VOLTAMMETRIES
+            )
+            if cv is not None and cv.cycles
+        ]
+        return cvs[0] if len(cvs) == 1 else None
+
+    def get_cycle(self):
+        cv = self.get_cyclic_voltammetry()
+        if cv is None or not cv.cycles:
+            return None
+        if self.cycle_number is None:
+            return cv.cycles[-1]
+        if not 1 <= self.cycle_number <= len(cv.cycles):
+            return None
+        return cv.cycles[self.cycle_number - 1]
+
+    def set_tafel_slope(self):
+        cycle = self.get_cycle()
+        if (
+            cycle is None
+            or cycle.voltage_rhe_compensated is None
+            or cycle.current_density is None
+        ):
+            return
+        voltage, current_density = get_backscan(
+            cycle.voltage_rhe_compensated.to('V').magnitude,
+            cycle.current_density.to('mA/cm^2').magnitude,
+        )
+        tafel_fit = fit_tafel_slope(
+            current_density, voltage, potential_range=(1.5, 1.53)
+        )
+        if tafel_fit is None:
+            return
+        # pint has no multiplicative decade unit, the slope is stored per decade
+        self.tafel_slope = tafel_fit['slope'] * ureg.V
+        self.tafel_intercept = tafel_fit['intercept'] * ureg.V
+        self.tafel_r_squared = tafel_fit['r_squared']
+
     def normalize(self, archive, logger):
         super().normalize(archive, logger)
 
@@ -878,6 +956,10 @@ class CE_AMCC_ReproducibilityStudy(BaseMeasurement, EntryData, PlotSection):
 
     def normalize(self, archive, logger):
         super().normalize(archive, logger)
+        # the cyclic voltammetries are normalized by now, fill the missing slopes
+        for cv_metrics in self.cv_metrics:
+            if cv_metrics.tafel_slope is None:
+                cv_metrics.set_tafel_slope()
         fig1 = make_current_density_over_voltage_rhe_cv_plot(self.cv_activation.cycles)
         self.figures = [
             PlotlyFigure(
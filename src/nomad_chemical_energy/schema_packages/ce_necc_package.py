@@ -35,12 +35,17 @@ from baseclasses.chemical_energy import (
     PotentiometryGasChromatographyMeasurement,
     ThermocoupleMeasurement,
 )
-from nomad.datamodel.data import EntryData
+from nomad.datamodel.data import ArchiveSection, EntryData
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
-from nomad.metainfo import Quantity, SchemaPackage, Section
+from nomad.metainfo import Quantity, SchemaPackage, Section, SubSection
 
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    ExcelWorkbook,
+    columns_starting_with,
+)
 from nomad_chemical_energy.schema_packages.file_parser.necc_excel_parser import (
     extract_properties,
+    get_summary_metrics,
     read_gaschromatography_data,
     read_ph_data,
     read_potentiostat_data,
@@ -48,6 +53,10 @@ from nomad_chemical_energy.schema_packages.file_parser.necc_excel_parser import
     read_thermocouple_data,
     set_catalyst_details,
 )
+from nomad_chemical_energy.schema_packages.utilities.decimation import (
+    minmax_decimation_indices,
+    nearest_indices,
+)
 from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
     make_bode_plot,
     make_current_density_over_voltage_rhe_cv_plot,
@@ -129,6 +138,172 @@ class CE_NECC_Measurement(BaseMeasurement, EntryData):
 # %%####################################### Measurements
 
 
+NECC_SUMMARY_GASES = ('CO', 'CH4', 'C2H4', 'C2H6', 'H2')
+
+
+class NECCSummaryMetrics(ArchiveSection):
+    """
+    Scalar metrics of an EC-GC experiment. They are indexed, so experiments can be
+    compared and ranked in the apps without loading their archives.
+    """
+
+    steady_state_start = Quantity(
+        type=np.dtype(np.float64),
+        unit='minute',
+        default=30,
+        description='Time after the first GC injection at which the steady state starts.',
+        a_eln=dict(component='NumberEditQuantity', defaultDisplayUnit='minute'),
+    )
+
+    co_mean_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Mean faradaic efficiency of CO in the steady-state window.',
+    )
+
+    co_min_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Minimum faradaic efficiency of CO in the steady-state window.',
+    )
+
+    co_max_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Maximum faradaic efficiency of CO in the steady-state window.',
+    )
+
+    ch4_mean_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Mean faradaic efficiency of CH4 in the steady-state window.',
+    )
+
+    ch4_min_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Minimum faradaic efficiency of CH4 in the steady-state window.',
+    )
+
+    ch4_max_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Maximum faradaic efficiency of CH4 in the steady-state window.',
+    )
+
+    c2h4_mean_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Mean faradaic efficiency of C2H4 in the steady-state window.',
+    )
+
+    c2h4_min_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Minimum faradaic efficiency of C2H4 in the steady-state window.',
+    )
+
+    c2h4_max_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Maximum faradaic efficiency of C2H4 in the steady-state window.',
+    )
+
+    c2h6_mean_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Mean faradaic efficiency of C2H6 in the steady-state window.',
+    )
+
+    c2h6_min_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Minimum faradaic efficiency of C2H6 in the steady-state window.',
+    )
+
+    c2h6_max_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Maximum faradaic efficiency of C2H6 in the steady-state window.',
+    )
+
+    h2_mean_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Mean faradaic efficiency of H2 in the steady-state window.',
+    )
+
+    h2_min_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Minimum faradaic efficiency of H2 in the steady-state window.',
+    )
+
+    h2_max_fe = Quantity(
+        type=np.dtype(np.float64),
+        unit='percent',
+        description='Maximum faradaic efficiency of H2 in the steady-state window.',
+    )
+
+    mean_cell_current = Quantity(
+        type=np.dtype(np.float64),
+        unit='mA',
+        description='Time-weighted mean cell current in the steady-state window.',
+    )
+
+    mean_cell_voltage = Quantity(
+        type=np.dtype(np.float64),
+        unit='V',
+        description='Time-weighted mean cell voltage in the steady-state window.',
+    )
+
+    cell_voltage_drift = Quantity(
+        type=np.dtype(np.float64),
+        unit='mV/hour',
+        description='Slope of a linear fit of the cell voltage in the steady-state window.',
+    )
+
+    def compute(self, fe_results):
+        if fe_results is None or not fe_results.datetime:
+            return
+        columns = {
+            'cell_current': fe_results.cell_current,
+            'cell_voltage': fe_results.cell_voltage,
+        }
+        for gas in fe_results.gas_results or []:
+            if (
+                gas.gas_type in NECC_SUMMARY_GASES
+                and gas.faradaic_efficiency is not None
+            ):
+                columns[gas.gas_type] = abs(gas.faradaic_efficiency.to('percent'))
+        units = {'cell_current': 'mA', 'cell_voltage': 'V'}
+        results_df = pd.DataFrame(
+            {
+                name: pd.Series(
+                    values.to(units[name]).magnitude
+                    if name in units and hasattr(values, 'to')
+                    else getattr(values, 'magnitude', values),
+                    dtype=float,
+                )
+                for name, values in columns.items()
+                if values is not None
+            }
+        )
+        results_df['datetime'] = pd.Series(
+            pd.to_datetime(fe_results.datetime, utc=True)
+        )
+        steady_state_start = (
+            self.steady_state_start.to('minute').magnitude
+            if self.steady_state_start is not None
+            else 0
+        )
+        metrics = get_summary_metrics(
+            results_df, NECC_SUMMARY_GASES, steady_state_start
+        )
+        for name, value in metrics.items():
+            setattr(self, name, value)
+
+
 class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, EntryData):
     m_def = Section(
         a_eln=dict(
@@ -150,11 +325,46 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                     'potentiometry',
                     'thermocouple',
                     'fe_results',
+                    'summary',
                 ]
             ),
         )
     )
 
+    summary = SubSection(section_def=NECCSummaryMetrics)
+
+    max_plot_points = Quantity(
+        type=int,
+        default=5000,
+        description='Maximum number of points plotted per time series.',
+        a_eln=dict(component='NumberEditQuantity'),
+    )
+
+    def get_decimated_trace(self, datetimes, values):
+        """
+        Returns x (as date strings) and y of a time series reduced to
+        `max_plot_points` points, keeping all extrema and the GC injection times.
+        """
+        values = np.asarray(getattr(values, 'magnitude', values))
+        datetimes = pd.to_datetime(datetimes[: len(values)], utc=True)
+        injection_times = pd.to_datetime(
+            [
+                date
+                for gc in self.gaschromatographies or []
+                for date in (gc.datetime if gc.datetime is not None else [])
+            ],
+            utc=True,
+        )
+        indices = minmax_decimation_indices(
+            values,
+            self.max_plot_points,
+            keep_indices=nearest_indices(
+                datetimes.values.astype('datetime64[ns]'),
+                injection_times.values.astype('datetime64[ns]'),
+            ),
+        )
+        return datetimes[indices].strftime('%Y-%m-%d %H:%M:%S'), values[indices]
+
     def make_total_fe_figure(self):
         def add_stacked_component(figure, label, x_list, y_list):
             if len(y_list) == 0:
@@ -277,17 +487,16 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
         )
         return fig
 
-    def make_current_voltage_figure(self, date_strings):
+    def make_current_voltage_figure(self):
         fig = go.Figure()
-        date_strings = [
-            date.strftime('%Y-%m-%d %H:%M:%S') for date in self.potentiometry.datetime
-        ]
+        datetimes = self.potentiometry.datetime
         if self.potentiometry.current is not None:
+            x, y = self.get_decimated_trace(datetimes, self.potentiometry.current)
             fig.add_trace(
                 go.Scatter(
                     name='Current',
-                    x=date_strings,
-                    y=self.potentiometry.current,
+                    x=x,
+                    y=y,
                     line=dict(color='red'),
                 )
             )
@@ -299,21 +508,27 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                 ),
             )
         if self.potentiometry.working_electrode_potential is not None:
+            x, y = self.get_decimated_trace(
+                datetimes, self.potentiometry.working_electrode_potential
+            )
             fig.add_trace(
                 go.Scatter(
                     name='Working electrode potential',
-                    x=date_strings,
-                    y=self.potentiometry.working_electrode_potential,
+                    x=x,
+                    y=y,
                     yaxis='y2',
                     line=dict(color='blue'),
                 )
             )
         if self.potentiometry.counter_electrode_potential is not None:
+            x, y = self.get_decimated_trace(
+                datetimes, self.potentiometry.counter_electrode_potential
+            )
             fig.add_trace(
                 go.Scatter(
                     name='Counter electrode potential',
-                    x=date_strings,
-                    y=self.potentiometry.counter_electrode_potential,
+                    x=x,
+                    y=y,
                     yaxis='y2',
                     line=dict(color='dodgerblue'),
                 )
@@ -333,14 +548,12 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                 ),
             )
         if self.ph.ph_value is not None:
-            ph_date_strings = [
-                date.strftime('%Y-%m-%d %H:%M:%S') for date in self.ph.datetime
-            ]
+            x, y = self.get_decimated_trace(self.ph.datetime, self.ph.ph_value)
             fig.add_trace(
                 go.Scatter(
                     name='pH',
-                    x=ph_date_strings,
-                    y=self.ph.ph_value,
+                    x=x,
+                    y=y,
                     yaxis='y3',
                     line=dict(color='green'),
                 )
@@ -444,14 +657,12 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                 ),
             )
         if self.ph.ph_value is not None:
-            ph_date_strings = [
-                date.strftime('%Y-%m-%d %H:%M:%S') for date in self.ph.datetime
-            ]
+            x, y = self.get_decimated_trace(self.ph.datetime, self.ph.ph_value)
             fig.add_trace(
                 go.Scatter(
                     name='pH',
-                    x=ph_date_strings,
-                    y=self.ph.ph_value,
+                    x=x,
+                    y=y,
                     yaxis='y4',
                     line=dict(color='green'),
                 )
@@ -483,16 +694,17 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
     def normalize(self, archive, logger):
         if self.data_file:
             with archive.m_context.raw_file(self.data_file, 'rb') as f:
-                xls_file = pd.ExcelFile(f)
+                workbook = ExcelWorkbook(f)
+                is_v1_excel = len(workbook.sheet_names) < 7
 
                 if self.properties is None:
-                    self.properties = extract_properties(xls_file)
+                    self.properties = extract_properties(workbook)
 
                 if self.properties.cathode is None or self.properties.anode is None:
-                    set_catalyst_details(archive, xls_file)
+                    set_catalyst_details(archive, workbook)
 
-                if not self.ph and len(xls_file.sheet_names) < 7:
-                    data = pd.read_excel(xls_file, sheet_name='Raw Data', header=1)
+                if not self.ph and is_v1_excel:
+                    data = workbook.read_sheet('Raw Data', header=1)
                     ph_data = self.get_cleaned_df(data, ['Date', 'pH Time', 'pH'])
                     ph_start_time = None
                     if data.columns.get_loc('pH') + 1 < len(data.columns):
@@ -544,11 +756,13 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                         'øC  cathode',
                         'øC  anode',
                     ]
-                    if len(xls_file.sheet_names) < 7:
-                        data = pd.read_excel(xls_file, sheet_name='Raw Data', header=1)
-                        results_data = pd.read_excel(
-                            xls_file, sheet_name='Results', header=0
+                    if is_v1_excel:
+                        # the raw data sheet is shared with the pH data read above
+                        sheets = workbook.read_sheets(
+                            {'Raw Data': {'header': 1}, 'Results': {'header': 0}}
                         )
+                        data = sheets['Raw Data']
+                        results_data = sheets['Results']
 
                         gc_data = self.get_cleaned_df(data, gc_columns)
                         pot_data = self.get_cleaned_df(data, pot_columns)
@@ -557,18 +771,28 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
                         ]  # thermo column names are in second row
                         thermo_data = self.get_cleaned_df(data[2:], thermo_columns)
                     else:
-                        pot_data = pd.read_excel(xls_file, sheet_name='Pot Data')
-                        thermo_data = pd.read_excel(xls_file, sheet_name='Thermo Data')
-                        fid_data = pd.read_excel(xls_file, sheet_name='FID Data')
-                        tcd_data = pd.read_excel(xls_file, sheet_name='TCD Data')
-                        results_data = pd.read_excel(
-                            xls_file, sheet_name='GC Calc', header=0
+                        gc_usecols = columns_starting_with(gc_columns)
+                        sheets = workbook.read_sheets(
+                            {
+                                'Pot Data': {
+                                    'usecols': columns_starting_with(pot_columns)
+                                },
+                                'Thermo Data': {
+                                    'usecols': columns_starting_with(thermo_columns)
+                                },
+                                'FID Data': {'usecols': gc_usecols},
+                                'TCD Data': {'usecols': gc_usecols},
+                                'GC Calc': {'header': 0},
+                            }
                         )
+                        results_data = sheets['GC Calc']
 
-                        pot_data = self.get_cleaned_df(pot_data, pot_columns)
-                        thermo_data = self.get_cleaned_df(thermo_data, thermo_columns)
-                        fid_data = self.get_cleaned_df(fid_data, gc_columns)
-                        tcd_data = self.get_cleaned_df(tcd_data, gc_columns)
+                        pot_data = self.get_cleaned_df(sheets['Pot Data'], pot_columns)
+                        thermo_data = self.get_cleaned_df(
+                            sheets['Thermo Data'], thermo_columns
+                        )
+                        fid_data = self.get_cleaned_df(sheets['FID Data'], gc_columns)
+                        tcd_data = self.get_cleaned_df(sheets['TCD Data'], gc_columns)
                         gc_data = pd.merge(
                             fid_data, tcd_data, on=['Date', 'Time '], how='inner'
                         )
@@ -613,6 +837,9 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
         self.properties.normalize(archive, logger)
         self.thermocouple.normalize(archive, logger)
         self.fe_results.normalize(archive, logger)
+        if self.summary is None:
+            self.summary = NECCSummaryMetrics()
+        self.summary.compute(self.fe_results)
         super().normalize(archive, logger)
 
         date_strings = [
@@ -620,7 +847,7 @@ class CE_NECC_EC_GC(PotentiometryGasChromatographyMeasurement, PlotSection, Entr
         ]
 
         fig1 = self.make_fe_figure(date_strings)
-        fig2 = self.make_current_voltage_figure(date_strings)
+        fig2 = self.make_current_voltage_figure()
         fig3 = self.make_overview_fig()
         self.figures = [
             PlotlyFigure(
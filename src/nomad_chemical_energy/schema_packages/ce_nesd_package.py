@@ -18,6 +18,7 @@
 
 import json
 import os
+import time
 
 import numpy as np
 from baseclasses import BaseMeasurement
@@ -62,6 +63,7 @@ from nomad_chemical_energy.schema_packages.file_parser.palmsense_parser import (
 )
 from nomad_chemical_energy.schema_packages.utilities.ce_nesd_oer_analysis import (
     NESD_OERAnalysis,
+    NESD_OERBatchAnalysis,
     NESD_OERCompareReplicates,
 )
 from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
@@ -214,16 +216,94 @@ class CE_NESD_Measurement(BaseMeasurement, EntryData):
 # %% ####################### Measurements
 
 
+FOLDER_INDEX_TTL = 60
+FOLDER_INDEX_SUFFIXES = (
+    '.tdms',
+    '.xlsx_setup.archive.json',
+    '.xlsx_sample.archive.json',
+)
+
+
+class _FolderIndex:
+    """
+    Maps every folder of an upload to its electrolyser data files and the setups and
+    samples created from NESD metadata excel files. The index is built from one
+    recursive listing of the upload and shared by all measurements processed
+    within `ttl` seconds, instead of listing the folder for every lookup. A lookup
+    that does not find exactly one file relists its folder, at most once per `ttl`,
+    so files created after the index was built are picked up.
+    """
+
+    def __init__(self, ttl=FOLDER_INDEX_TTL):
+        self.ttl = ttl
+        self._indices = {}
+
+    def _add_files(self, folders, items):
+        for item in items:
+            suffix = next(
+                (
+                    suffix
+                    for suffix in FOLDER_INDEX_SUFFIXES
+                    if item.path.endswith(suffix)
+                ),
+                None,
+            )
+            if suffix is None:
+                continue
+            folder = os.path.dirname(item.path)
+            folders.setdefault(folder, {}).setdefault(suffix, []).append(item.path)
+
+    def _get_index(self, archive):
+        now = time.monotonic()
+        upload_id = archive.metadata.upload_id
+        index = self._indices.get(upload_id)
+        if index is None or now - index[0] >= self.ttl:
+            self._indices = {
+                key: value
+                for key, value in self._indices.items()
+                if now - value[0] < self.ttl
+            }
+            folders = {}
+            self._add_files(
+                folders,
+                archive.m_context.upload_files.raw_directory_list(
+                    recursive=True, files_only=True
+                ),
+            )
+            # the folders relisted since the index was built, with the time
+            index = (now, folders, {})
+            self._indices[upload_id] = index
+        return index
+
+    def get_file(self, archive, folder, suffix):
+        """
+        Returns the only file in `folder` ending with `suffix`, or None if there is
+        none or more than one.
+        """
+        _, folders, relisted = self._get_index(archive)
+        files = folders.get(folder, {}).get(suffix, [])
+        now = time.monotonic()
+        if len(files) != 1 and now - relisted.get(folder, -self.ttl) >= self.ttl:
+            # the index is stale if files were created or removed after it was
+            # built, e.g. by the metadata excel parser in the same processing run
+            relisted[folder] = now
+            folders.pop(folder, None)
+            self._add_files(
+                folders, archive.m_context.upload_files.raw_directory_list(folder)
+            )
+            files = folders.get(folder, {}).get(suffix, [])
+        return files[0] if len(files) == 1 else None
+
+
+_folder_index = _FolderIndex()
+
+
 def find_electrolyser_in_folder(archive, datafile):
     folder = os.path.dirname(datafile)
-    tdms_files = []
-    for item in archive.m_context.upload_files.raw_directory_list(folder):
-        if not item.path.endswith('.tdms'):
-            continue
-        tdms_files.append(item.path)
-    if len(tdms_files) == 1:
+    tdms_file = _folder_index.get_file(archive, folder, '.tdms')
+    if tdms_file:
         electrolyser_entry_id = get_entry_id_from_file_name(
-            tdms_files[0].split('.')[0] + '_electrolyser.archive.json', archive
+            tdms_file.split('.')[0] + '_electrolyser.archive.json', archive
         )
         return [
             CompositeSystemReference(
@@ -237,26 +317,18 @@ def find_electrolyser_in_folder(archive, datafile):
 def find_setup_in_folder(archive, datafile):
     # this function only finds setups that are created via the NESD metadata excel file (xlsx_setup ending)
     folder = os.path.dirname(datafile)
-    setup_files = []
-    for item in archive.m_context.upload_files.raw_directory_list(folder):
-        if not item.path.endswith('.xlsx_setup.archive.json'):
-            continue
-        setup_files.append(item.path)
-    if len(setup_files) == 1:
-        setup_entry_id = get_entry_id_from_file_name(setup_files[0], archive)
+    setup_file = _folder_index.get_file(archive, folder, '.xlsx_setup.archive.json')
+    if setup_file:
+        setup_entry_id = get_entry_id_from_file_name(setup_file, archive)
         return get_reference(archive.metadata.upload_id, setup_entry_id)
 
 
 def find_sample_in_folder(archive, datafile):
     # this function only finds samples that are created via the NESD metadata excel file (xlsx_sample ending)
     folder = os.path.dirname(datafile)
-    sample_files = []
-    for item in archive.m_context.upload_files.raw_directory_list(folder):
-        if not item.path.endswith('.xlsx_sample.archive.json'):
-            continue
-        sample_files.append(item.path)
-    if len(sample_files) == 1:
-        sample_entry_id = get_entry_id_from_file_name(sample_files[0], archive)
+    sample_file = _folder_index.get_file(archive, folder, '.xlsx_sample.archive.json')
+    if sample_file:
+        sample_entry_id = get_entry_id_from_file_name(sample_file, archive)
         return [
             CompositeSystemReference(
                 reference=get_reference(archive.metadata.upload_id, sample_entry_id)
@@ -1234,6 +1306,15 @@ class CE_NESD_OERAnalysis(NESD_OERAnalysis, EntryData):
     )
 
 
+class CE_NESD_OERBatchAnalysis(NESD_OERBatchAnalysis, EntryData):
+    m_def = Section(
+        a_eln=dict(
+            hide=['location', 'lab_id', 'description', 'method', 'steps'],
+            properties=dict(order=['name']),
+        )
+    )
+
+
 class CE_NESD_OERCompareReplicates(NESD_OERCompareReplicates, EntryData):
     m_def = Section(
         a_eln=dict(
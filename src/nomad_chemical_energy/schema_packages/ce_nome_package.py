@@ -16,9 +16,11 @@
 # limitations under the License.
 #
 
+import hashlib
 import json
 import os
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from baseclasses import BaseMeasurement, BaseProcess, PubChemPureSubstanceSectionCustom
@@ -49,23 +51,38 @@ from baseclasses.chemical_energy import (
     SubstanceWithConcentration,
     SubstrateProperties,
     UVvisDataConcentration,
-    get_next_project_sample_number,
 )
 from baseclasses.data_transformations import UVvisConcentrationDetection
 from baseclasses.design1 import Design
 from baseclasses.documentation_tool import DocumentationTool
-from baseclasses.helper.utilities import create_archive, find_sample_by_id, rewrite_json
+from baseclasses.helper.utilities import (
+    find_sample_by_id,
+    get_reference,
+    rewrite_json,
+)
 from baseclasses.material_processes_misc import Annealing
 from baseclasses.solar_energy import UVvisMeasurement
 from baseclasses.voila import VoilaNotebook
-from nomad.datamodel.data import EntryData
+from nomad.datamodel.data import ArchiveSection, EntryData
 from nomad.datamodel.metainfo.basesections import Process
 from nomad.datamodel.metainfo.eln import Substance
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
 
 # from nomad.units import ureg
-from nomad.metainfo import Quantity, SchemaPackage, Section, SubSection
+from nomad.metainfo import MEnum, Quantity, SchemaPackage, Section, SubSection
 
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    ExcelWorkbook,
+)
+from nomad_chemical_energy.schema_packages.utilities.archive_batch import (
+    ArchiveBatch,
+)
+from nomad_chemical_energy.schema_packages.utilities.decimation import (
+    minmax_decimation_indices,
+)
+from nomad_chemical_energy.schema_packages.utilities.lab_ids import (
+    reserve_lab_id_numbers,
+)
 from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
     make_current_density_plot,
     make_current_plot,
@@ -312,20 +329,12 @@ class CE_NOME_Annealing(Process, EntryData):
 #     )
 
 
-def get_next_free_project_number(archive, entity_id):
-    from nomad.app.v1.models import MetadataPagination
-    from nomad.search import search
-
-    query = {'results.eln.lab_ids': entity_id}
-    pagination = MetadataPagination()
-    pagination.page_size = 9999
-    search_result = search(
-        owner='all',
-        query=query,
-        pagination=pagination,
-        user_id=archive.metadata.main_author.user_id,
-    )
-    return get_next_project_sample_number(search_result.data, entity_id)
+def get_next_free_project_number(archive, entity_id, count=1):
+    """
+    Reserves `count` consecutive project numbers for lab ids of the form
+    `{entity_id}_{number:04d}` and returns the first one.
+    """
+    return reserve_lab_id_numbers(archive, f'{entity_id}_', count, digits=4)
 
 
 def get_parameter(obj, key):
@@ -343,28 +352,88 @@ def get_number_of_substances(row, prefix):
     return sum([s.startswith(prefix) for s in list(row.keys())])
 
 
-def set_setup(archive, row):
+def get_sheet_rows(sheet):
+    """
+    Returns the rows of a sheet as dicts with missing values replaced by None, so
+    that the rows can be mapped without per-row pandas lookups.
+    """
+    return sheet.astype(object).where(sheet.notna(), None).to_dict('records')
+
+
+def assign_lab_ids(sheet, id_base, next_free_id):
+    """
+    Assigns consecutive lab ids starting at `next_free_id` to all rows of the sheet
+    without an existing CE-NOME id. Returns the number of ids used.
+    """
+    is_new = ~sheet['id'].str.startswith('CE-NOME')
+    number_of_new_ids = int(is_new.sum())
+    sheet.loc[is_new, 'id'] = [
+        f'{id_base}_{next_free_id + idx:04d}' for idx in range(number_of_new_ids)
+    ]
+    return number_of_new_ids
+
+
+def find_samples_by_ids(archive, sample_ids):
+    """
+    Returns a dict of lab id to reference for all given lab ids found with a single
+    (paged) search.
+    """
+    from nomad.app.v1.models import MetadataPagination, MetadataRequired
+    from nomad.search import search
+
+    sample_ids = sorted({str(sample_id) for sample_id in sample_ids if sample_id})
+    if not sample_ids:
+        return {}
+    pagination = MetadataPagination()
+    pagination.page_size = 1000
+    required = MetadataRequired()
+    required.include = ['entry_id', 'upload_id', 'results.eln.lab_ids']
+    references = {}
+    while len(references) < len(sample_ids):
+        search_result = search(
+            owner='all',
+            query={'results.eln.lab_ids:any': sample_ids},
+            pagination=pagination,
+            required=required,
+            user_id=archive.metadata.main_author.user_id,
+        )
+        for entry in search_result.data:
+            for lab_id in entry.get('results', {}).get('eln', {}).get('lab_ids', []):
+                if lab_id in sample_ids and lab_id not in references:
+                    references[lab_id] = get_reference(
+                        entry['upload_id'], entry['entry_id']
+                    )
+        next_page_after_value = search_result.pagination.next_page_after_value
+        if not next_page_after_value:
+            break
+        pagination.page_after_value = next_page_after_value
+    return references
+
+
+def set_setup(archive, row, references=None):
+    def find_reference(sample_id):
+        if references is not None:
+            return references.get(str(sample_id)) if sample_id else None
+        return find_sample_by_id(archive, sample_id)
+
+    equipment = [
+        find_reference(get_parameter(row, f'equipment_{i}'))
+        for i in range(5)
+        if get_parameter(row, f'equipment_{i}')
+    ]
     return CE_NOME_ElectroChemicalSetup(
         name=get_parameter(row, 'name'),
         setup=get_parameter(row, 'setup'),
-        reference_electrode=find_sample_by_id(
-            archive, get_parameter(row, 'reference_electrode')
-        ),
-        counter_electrode=find_sample_by_id(
-            archive, get_parameter(row, 'counter_electrode')
-        ),
-        equipment=[
-            find_sample_by_id(archive, row[f'equipment_{i}'])
-            for i in range(5)
-            if get_parameter(row, f'equipment_{i}')
-            and find_sample_by_id(archive, row[f'equipment_{i}'])
-        ],
+        reference_electrode=find_reference(get_parameter(row, 'reference_electrode')),
+        counter_electrode=find_reference(get_parameter(row, 'counter_electrode')),
+        equipment=[reference for reference in equipment if reference],
         description=get_parameter(row, 'description'),
     )
 
 
-def set_environment(row):
-    number_of_substances_per_env = get_number_of_substances(row, 'substance_name_')
+def set_environment(row, number_of_substances_per_env=None):
+    if number_of_substances_per_env is None:
+        number_of_substances_per_env = get_number_of_substances(row, 'substance_name_')
     return CE_NOME_Environment(
         name=get_parameter(row, 'name'),
         ph_value=get_parameter(row, 'ph_value'),
@@ -403,10 +472,11 @@ def set_environment(row):
     )
 
 
-def set_sample(row):
-    number_of_substances_per_synthesis = get_number_of_substances(
-        row, 'substance_name_'
-    )
+def set_sample(row, number_of_substances_per_synthesis=None):
+    if number_of_substances_per_synthesis is None:
+        number_of_substances_per_synthesis = get_number_of_substances(
+            row, 'substance_name_'
+        )
     return CE_NOME_Sample(
         name=get_parameter(row, 'name'),
         chemical_composition_or_formulas=get_parameter(
@@ -503,96 +573,100 @@ class CE_NOME_DocumentationTool(DocumentationTool, EntryData):
             with archive.m_context.raw_file(archive.metadata.mainfile) as f:
                 path = os.path.dirname(f.name)
             # load data
-            xls = pd.ExcelFile(os.path.join(path, self.data_file))
-            samples = pd.read_excel(xls, 'samples').astype({'id': 'str'})
-            envs = pd.read_excel(xls, 'environments').astype({'id': 'str'})
-            setups = pd.read_excel(xls, 'setups').astype({'id': 'str'})
+            sheets = ExcelWorkbook(os.path.join(path, self.data_file)).read_sheets(
+                {'samples': {}, 'environments': {}, 'setups': {}}
+            )
+            samples = sheets['samples'].astype({'id': 'str'})
+            envs = sheets['environments'].astype({'id': 'str'})
+            setups = sheets['setups'].astype({'id': 'str'})
 
-            # prepare id
+            # prepare ids, environments and setups share one range of ids
             id_base = '_'.join(self.lab_id.split('_')[:-1])
             id_base_sample = '_'.join(
                 [id_base, self.datetime.strftime('%y%m%d')]
             )  # today??
-            next_free_id = get_next_free_project_number(archive, id_base)
-            next_free_id_sample = get_next_free_project_number(archive, id_base_sample)
-            counter = 0
-            counter_sample = 0
-
-            # samples
-            for idx, row in samples.iterrows():
-                edit = True if row[0].startswith('CE-NOME') else False
-                try:
-                    ce_nome_sample = set_sample(row)
-                    ce_nome_sample.lab_id = (
-                        f'{id_base_sample}_{next_free_id_sample + counter_sample:04d}'
-                        if not edit
-                        else row[0]
-                    )
-                    file_name = f'{archive.metadata.mainfile.replace(".archive.json", "")}_sample_{idx}.archive.json'
-                    create_archive(ce_nome_sample, archive, file_name, overwrite=edit)
-                    samples.at[idx, 'id'] = ce_nome_sample.lab_id
-
-                    if not edit:
-                        counter_sample += 1
-                except Exception as e:
-                    logger.error(
-                        f'could not create row {idx} for samples',
-                        normalizer=self.__class__.__name__,
-                        section='system',
-                    )
-                    raise e
-            # environments
-            for idx, row in envs.iterrows():
-                edit = True if row[0].startswith('CE-NOME') else False
-                try:
-                    ce_nome_envs = set_environment(row)
-                    ce_nome_envs.lab_id = (
-                        f'{id_base}_{next_free_id + counter:04d}'
-                        if not edit
-                        else row[0]
-                    )
-                    file_name = f'{archive.metadata.mainfile.replace(".archive.json", "")}_env_{idx}.archive.json'
-                    create_archive(ce_nome_envs, archive, file_name, overwrite=edit)
-                    envs.at[idx, 'id'] = ce_nome_envs.lab_id
-
-                    if not edit:
-                        counter += 1
-                except Exception as e:
-                    logger.error(
-                        f'could not create row {idx} for environment',
-                        normalizer=self.__class__.__name__,
-                        section='system',
-                    )
-                    raise e
+            edits = {
+                name: sheet['id'].str.startswith('CE-NOME').tolist()
+                for name, sheet in (
+                    ('samples', samples),
+                    ('environment', envs),
+                    ('setups', setups),
+                )
+            }
+            number_of_new_ids = {
+                name: edit.count(False) for name, edit in edits.items()
+            }
+            next_free_id = get_next_free_project_number(
+                archive,
+                id_base,
+                number_of_new_ids['environment'] + number_of_new_ids['setups'],
+            )
+            next_free_id_sample = get_next_free_project_number(
+                archive, id_base_sample, number_of_new_ids['samples']
+            )
+            assign_lab_ids(samples, id_base_sample, next_free_id_sample)
+            assign_lab_ids(envs, id_base, next_free_id)
+            assign_lab_ids(
+                setups, id_base, next_free_id + number_of_new_ids['environment']
+            )
 
-            # setups
-            for idx, row in setups.iterrows():
-                edit = True if row[0].startswith('CE-NOME') else False
-                try:
-                    ce_nome_setup = set_setup(archive, row)
-                    ce_nome_setup.lab_id = (
-                        f'{id_base}_{next_free_id + counter:04d}'
-                        if not edit
-                        else row[0]
-                    )
-                    file_name = f'{archive.metadata.mainfile.replace(".archive.json", "")}_setup_{idx}.archive.json'
-                    create_archive(ce_nome_setup, archive, file_name, overwrite=edit)
-                    setups.at[idx, 'id'] = ce_nome_setup.lab_id
+            # all electrodes and equipment of the setups are looked up at once
+            references = find_samples_by_ids(
+                archive,
+                [
+                    value
+                    for column in setups.columns
+                    if column in {'reference_electrode', 'counter_electrode'}
+                    or column.startswith('equipment_')
+                    for value in setups[column].dropna()
+                ],
+            )
+            number_of_substances_sample = get_number_of_substances(
+                samples, 'substance_name_'
+            )
+            number_of_substances_env = get_number_of_substances(envs, 'substance_name_')
+            mappers = {
+                'samples': (
+                    'sample',
+                    samples,
+                    lambda row: set_sample(row, number_of_substances_sample),
+                ),
+                'environment': (
+                    'env',
+                    envs,
+                    lambda row: set_environment(row, number_of_substances_env),
+                ),
+                'setups': (
+                    'setup',
+                    setups,
+                    lambda row: set_setup(archive, row, references),
+                ),
+            }
 
-                    if not edit:
-                        counter += 1
-                except Exception as e:
-                    logger.error(
-                        f'could not create row {idx} for setups',
-                        normalizer=self.__class__.__name__,
-                        section='system',
-                    )
-                    raise e
+            file_prefix = archive.metadata.mainfile.replace('.archive.json', '')
+            archive_batch = ArchiveBatch(archive)
+            for name, (suffix, sheet, map_row) in mappers.items():
+                rows = zip(sheet.index, get_sheet_rows(sheet), edits[name])
+                for idx, row, edit in rows:
+                    try:
+                        entry = map_row(row)
+                        entry.lab_id = row['id']
+                        file_name = f'{file_prefix}_{suffix}_{idx}.archive.json'
+                        archive_batch.add(entry, file_name, overwrite=edit)
+                    except Exception as e:
+                        logger.error(
+                            f'could not create row {idx} for {name}',
+                            normalizer=self.__class__.__name__,
+                            section='system',
+                        )
+                        raise e
+            archive_batch.flush()
 
-            with pd.ExcelWriter(os.path.join(path, self.data_file)) as writer:
-                samples.to_excel(writer, sheet_name='samples', index=False)
-                envs.to_excel(writer, sheet_name='environments', index=False)
-                setups.to_excel(writer, sheet_name='setups', index=False)
+            if any(number_of_new_ids.values()):
+                with pd.ExcelWriter(os.path.join(path, self.data_file)) as writer:
+                    samples.to_excel(writer, sheet_name='samples', index=False)
+                    envs.to_excel(writer, sheet_name='environments', index=False)
+                    setups.to_excel(writer, sheet_name='setups', index=False)
 
 
 # %%####################################### Measurements
@@ -1408,75 +1482,241 @@ class CE_NOME_UVvismeasurement(UVvisMeasurement, EntryData, PlotSection):
 
     measurements = SubSection(section_def=UVvisDataConcentration, repeats=True)
 
-    def normalize(self, archive, logger):
-        import pandas as pd
+    def get_traces(self, measurement):
+        return [
+            go.Scatter(
+                name=measurement.name,
+                legendgroup=measurement.name,
+                x=measurement.wavelength,
+                y=measurement.intensity,
+                mode='lines',
+            ).to_plotly_json(),
+            go.Scatter(
+                name='peaks',
+                legendgroup=measurement.name,
+                x=[measurement.peak_wavelength],
+                y=[measurement.peak_value],
+                mode='markers',
+                line_color='black',
+                showlegend=False,
+            ).to_plotly_json(),
+        ]
 
-        measurements = []
+    def normalize(self, archive, logger):
+        from nomad_chemical_energy.schema_packages.file_parser.uvvis_parser import (
+            UVVIS_FILE_EXTENSIONS,
+            read_uvvis_files,
+        )
 
         if self.data_file is not None:
-            for data_file in self.data_file:
-                is_new_data = True
-                for measurement in self.measurements:
-                    if data_file == measurement.name:
-                        is_new_data = False
-                        measurements.append(measurement)
-                if is_new_data:
-                    datetime_object = None
-                    if os.path.splitext(data_file)[-1] not in ['.ABS', '.csv']:
-                        continue
-                    delimiter = ''
-                    if os.path.splitext(data_file)[-1] == '.csv':
-                        delimiter = ','
-                    if os.path.splitext(data_file)[-1] == '.ABS':
-                        delimiter = '  '
-                    from baseclasses.helper.archive_builder.uvvis_archive import (
-                        get_uvvis_concentration_archive,
-                    )
+            existing = {}
+            for measurement in self.measurements:
+                existing.setdefault(measurement.name, []).append(measurement)
+            new_files = [
+                data_file
+                for data_file in dict.fromkeys(self.data_file)
+                if data_file not in existing
+                and os.path.splitext(data_file)[-1] in UVVIS_FILE_EXTENSIONS
+            ]
+            if new_files:
+                from baseclasses.helper.archive_builder.uvvis_archive import (
+                    get_uvvis_concentration_archive,
+                )
 
-                    with archive.m_context.raw_file(data_file, 'rt') as f:
-                        data = pd.read_csv(
-                            f, delimiter=delimiter, header=None, skiprows=2
-                        )
-                    measurements.append(
-                        get_uvvis_concentration_archive(
-                            data, datetime_object, data_file
-                        )
-                    )
+                for data_file, data in zip(
+                    new_files, read_uvvis_files(archive, new_files)
+                ):
+                    measurement = get_uvvis_concentration_archive(data, None, data_file)
+                    measurement.normalize(archive, logger)
+                    existing[data_file] = [measurement]
+
+            measurements = []
+            for data_file in self.data_file:
+                measurements.extend(existing.pop(data_file, []))
             self.measurements = measurements
 
-            fig = go.Figure()
+            # traces of spectra already in the figure are kept, only the new
+            # spectra are added
+            traces = {}
+            for trace in self.figures[0].figure.get('data', []) if self.figures else []:
+                if trace.get('legendgroup') not in new_files:
+                    traces.setdefault(trace.get('legendgroup'), []).append(trace)
+            figure_data = []
             for measurement in self.measurements:
-                measurement.normalize(archive, logger)
-                fig.add_traces(
-                    go.Scatter(
-                        name=measurement.name,
-                        x=measurement.wavelength,
-                        y=measurement.intensity,
-                        mode='lines',
+                if measurement.name not in traces:
+                    traces[measurement.name] = self.get_traces(measurement)
+                figure_data.extend(traces[measurement.name])
+
+            if self.measurements:
+                layout = go.Layout(
+                    showlegend=True,
+                    xaxis={'fixedrange': False},
+                    xaxis_title=f'Wavelength [{self.measurements[0].wavelength.units}]',
+                    yaxis_title='Intensity',
+                    title_text='UVvis',
+                ).to_plotly_json()
+                self.figures = [
+                    PlotlyFigure(
+                        label='figure 1',
+                        figure={'data': figure_data, 'layout': layout},
                     )
-                )
-                fig.add_traces(
-                    go.Scatter(
-                        name='peaks',
-                        x=[measurement.peak_wavelength],
-                        y=[measurement.peak_value],
-                        mode='markers',
-                        line_color='black',
-                        showlegend=False,
-                    )
-                )
-            fig.update_layout(showlegend=True, xaxis={'fixedrange': False})
-            fig.update_layout(
-                xaxis_title=f'Wavelength [{self.measurements[0].wavelength.units}]',
-                yaxis_title='Intensity',
-                title_text='UVvis',
-            )
-            self.figures = [PlotlyFigure(label='figure 1', figure=fig.to_plotly_json())]
+                ]
 
         super().normalize(archive, logger)
 
 
-class CE_NOME_PhaseFluorometryOxygen(PhaseFluorometryOxygen, EntryData):
+class SensorLogAggregation(ArchiveSection):
+    bucket_size = Quantity(
+        type=np.dtype(np.float64),
+        unit='s',
+        description="""
+        Length of the time buckets the stored series are aggregated over. If
+        empty, long logs are reduced to about 10000 buckets.
+        """,
+        a_eln=dict(component='NumberEditQuantity', defaultDisplayUnit='s'),
+    )
+
+    bucket_aggregation = Quantity(
+        type=MEnum('mean', 'min', 'max'),
+        default='mean',
+        description='Value stored for every time bucket.',
+        a_eln=dict(component='EnumEditQuantity'),
+    )
+
+    aggregated_bucket_size = Quantity(
+        type=np.dtype(np.float64),
+        unit='s',
+        description="""
+        Length of the time buckets the stored series were aggregated over, either
+        the configured bucket size or the one chosen automatically. Empty if the
+        series are stored in full resolution.
+        """,
+    )
+
+    full_resolution_file = Quantity(
+        type=str,
+        description="""
+        Numpy archive with all numeric columns of the log in full resolution and
+        their times as seconds since the epoch in `epoch_seconds`.
+        """,
+        a_browser=dict(adaptor='RawFileAdaptor'),
+    )
+
+    full_resolution_checksum = Quantity(
+        type=str,
+        description='MD5 checksum of the data file the full resolution was saved from.',
+    )
+
+    def get_data_file_checksum(self, archive):
+        checksum = hashlib.md5()
+        with archive.m_context.raw_file(self.data_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                checksum.update(block)
+        return checksum.hexdigest()
+
+    def get_full_resolution_file_name(self, archive):
+        """
+        Returns the file name to save the full resolution to, or None if the file
+        is up to date with the data file or cannot be written.
+        """
+        from nomad.datamodel.context import ClientContext
+
+        if isinstance(archive.m_context, ClientContext):
+            return None
+        file_name = f'{os.path.splitext(self.data_file)[0]}.full_resolution.npz'
+        checksum = self.get_data_file_checksum(archive)
+        if checksum == self.full_resolution_checksum and (
+            archive.m_context.raw_path_exists(file_name)
+        ):
+            return None
+        self.full_resolution_checksum = checksum
+        return file_name
+
+    def get_sensor_log_bucket_size(self, file_obj, get_datetimes):
+        """
+        Returns the configured bucket size in seconds, or one chosen from the
+        number of rows and the duration of the log, read chunk by chunk.
+        """
+        from nomad_chemical_energy.schema_packages.file_parser.sensor_log_parser import (
+            iter_sensor_log,
+        )
+        from nomad_chemical_energy.schema_packages.utilities.time_buckets import (
+            get_epoch_seconds,
+            get_range_bucket_size,
+        )
+
+        if self.bucket_size is not None:
+            return self.bucket_size.to('s').magnitude
+        num_points, start, stop = 0, np.inf, -np.inf
+        for chunk in iter_sensor_log(file_obj):
+            datetimes = get_datetimes(chunk)
+            if datetimes is None:
+                return None
+            seconds = get_epoch_seconds(datetimes)
+            seconds = seconds[np.isfinite(seconds)]
+            if len(seconds):
+                num_points += len(seconds)
+                start = min(start, seconds.min())
+                stop = max(stop, seconds.max())
+        return get_range_bucket_size(num_points, start, stop)
+
+    def aggregate_sensor_log(self, archive, file_obj, get_datetimes, logger=None):
+        """
+        Reads the sensor log at the current position of `file_obj` chunk by chunk
+        and returns it aggregated over time buckets, so long logs are never loaded
+        as a whole. `get_datetimes` returns the times of the rows of a chunk. The
+        full resolution is saved next to the data file whenever the data file
+        changed. Returns the whole log if it is short or has no time.
+        """
+        from nomad_chemical_energy.schema_packages.file_parser.sensor_log_parser import (
+            iter_sensor_log,
+            read_sensor_log,
+        )
+        from nomad_chemical_energy.schema_packages.utilities.time_buckets import (
+            TimeBucketAggregator,
+            get_array_columns,
+            get_epoch_seconds,
+        )
+
+        position = file_obj.tell()
+        # coerced values are logged once, while aggregating
+        bucket_size = self.get_sensor_log_bucket_size(file_obj, get_datetimes)
+        file_obj.seek(position)
+        self.aggregated_bucket_size = None
+        if not bucket_size:
+            return read_sensor_log(file_obj, logger=logger)
+
+        file_name = self.get_full_resolution_file_name(archive)
+        aggregator = TimeBucketAggregator(
+            bucket_size, self.bucket_aggregation or 'mean'
+        )
+        arrays = []
+        for chunk in iter_sensor_log(file_obj, logger=logger):
+            datetimes = get_datetimes(chunk)
+            if datetimes is None:
+                file_obj.seek(position)
+                return read_sensor_log(file_obj, logger=logger)
+            seconds = get_epoch_seconds(datetimes)
+            aggregator.add(chunk, seconds)
+            if file_name:
+                arrays.append({**get_array_columns(chunk), 'epoch_seconds': seconds})
+        if file_name:
+            with archive.m_context.raw_file(file_name, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    **{
+                        column: np.concatenate([array[column] for array in arrays])
+                        for column in (arrays[0] if arrays else {})
+                    },
+                )
+            self.full_resolution_file = file_name
+        self.aggregated_bucket_size = bucket_size
+        return aggregator.finish()
+
+
+class CE_NOME_PhaseFluorometryOxygen(
+    PhaseFluorometryOxygen, SensorLogAggregation, EntryData
+):
     m_def = Section(
         a_eln=dict(
             hide=[
@@ -1523,10 +1763,14 @@ class CE_NOME_PhaseFluorometryOxygen(PhaseFluorometryOxygen, EntryData):
                         )
 
                         from nomad_chemical_energy.schema_packages.file_parser.pfo_parser import (
-                            get_pfo_measurement_csv,
+                            get_pfo_datetimes,
+                            locate_pfo_header,
                         )
 
-                        data = get_pfo_measurement_csv(f)
+                        locate_pfo_header(f)
+                        data = self.aggregate_sensor_log(
+                            archive, f, get_pfo_datetimes, logger
+                        )
                         get_pfo_archive(data, self)
                 if os.path.splitext(self.data_file)[-1] == '.xlsx':
                     with archive.m_context.raw_file(self.data_file, 'rb') as f:
@@ -1547,7 +1791,7 @@ class CE_NOME_PhaseFluorometryOxygen(PhaseFluorometryOxygen, EntryData):
         super().normalize(archive, logger)
 
 
-class CE_NOME_PumpRateMeasurement(PumpRateMeasurement, EntryData):
+class CE_NOME_PumpRateMeasurement(PumpRateMeasurement, SensorLogAggregation, EntryData):
     m_def = Section(
         a_eln=dict(
             hide=[
@@ -1594,11 +1838,14 @@ class CE_NOME_PumpRateMeasurement(PumpRateMeasurement, EntryData):
                         )
 
                         from nomad_chemical_energy.schema_packages.file_parser.pumprate_parser import (
-                            get_pump_rate_measurement_csv,
+                            get_pump_rate_datetimes,
+                            set_pump_rate_durations,
                         )
 
-                        data = get_pump_rate_measurement_csv(f)
-                        get_pump_rate_archive(data, self)
+                        data = self.aggregate_sensor_log(
+                            archive, f, get_pump_rate_datetimes, logger
+                        )
+                        get_pump_rate_archive(set_pump_rate_durations(data), self)
 
             except Exception as e:
                 logger.error(e)
@@ -1639,29 +1886,109 @@ class CE_NOME_TIF_Image(BaseMeasurement, EntryData):
         a_browser=dict(adaptor='RawFileAdaptor'),
     )
 
-    def normalize(self, archive, logger):
-        import tempfile
+    image_tiles = Quantity(
+        type=str,
+        description="""
+        Folder of the preview tile pyramid. The tiles are stored as
+        `{level}/{row}_{column}.png`, level 0 fits into a single tile and every
+        further level doubles the resolution.
+        """,
+    )
+
+    image_checksum = Quantity(
+        type=str,
+        description='MD5 checksum of the image the preview and tiles were saved from.',
+    )
+
+    def get_image_checksum(self, archive):
+        checksum = hashlib.md5()
+        with archive.m_context.raw_file(self.image, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                checksum.update(block)
+        return checksum.hexdigest()
+
+    def has_tif_previews(self, archive, checksum):
+        return (
+            checksum == self.image_checksum
+            and self.image_preview is not None
+            and self.image_tiles is not None
+            and archive.m_context.raw_path_exists(self.image_preview)
+            and archive.m_context.raw_path_exists(
+                os.path.join(self.image_tiles, '0', '0_0.png')
+            )
+        )
 
+    def save_tif_previews(self, archive, file_path):
+        """
+        Saves the preview and the tile pyramid of a plain TIFF, unless they were
+        already saved from the same image. Returns True if they are up to date.
+        """
+        from nomad_chemical_energy.schema_packages.utilities.image_pyramid import (
+            PREVIEW_MAX_SIZE,
+            PYRAMID_MAX_SIZE,
+            downscale,
+            get_pyramid_levels,
+            iter_tiles,
+            read_tif_plane,
+            save_png,
+            to_uint8,
+        )
+
+        checksum = self.get_image_checksum(archive)
+        if self.has_tif_previews(archive, checksum):
+            return True
+        data = read_tif_plane(file_path)
+        base = to_uint8(downscale(data, PYRAMID_MAX_SIZE))
+        del data
+
+        file_base = os.path.splitext(self.image)[0]
+        with archive.m_context.raw_file(f'{file_base}.png', 'wb') as f:
+            save_png(downscale(base, PREVIEW_MAX_SIZE), f)
+        self.image_preview = f'{file_base}.png'
+
+        tile_folder = f'{file_base}_tiles'
+        for level_idx, level in enumerate(get_pyramid_levels(base)):
+            for row, col, tile in iter_tiles(level):
+                tile_file = os.path.join(
+                    tile_folder, str(level_idx), f'{row}_{col}.png'
+                )
+                with archive.m_context.raw_file(tile_file, 'wb') as f:
+                    save_png(tile, f)
+        self.image_tiles = tile_folder
+        self.image_checksum = checksum
+        return True
+
+    def save_hyperspy_preview(self, file_path):
         import hyperspy.api as hs
 
+        png_file = os.path.splitext(file_path)[0] + '.png'
+        hs.load(file_path).save(png_file, overwrite=True)
+        self.image_preview = os.path.splitext(self.image)[0] + '.png'
+
+    def normalize(self, archive, logger):
         self.method = 'Vis Image'
         if self.image:
             with archive.m_context.raw_file(self.image, 'rb') as f:
-                image_file_name = f.name
-                file_content = f.read()
+                file_path = f.name
+            saved_previews = False
+            if os.path.splitext(self.image)[-1].lower() in ('.tif', '.tiff'):
+                try:
+                    saved_previews = self.save_tif_previews(archive, file_path)
+                except Exception as e:
+                    logger.warning(
+                        f'could not read {self.image} as plain TIFF: {e}',
+                        normalizer=self.__class__.__name__,
+                        section='system',
+                    )
+            if not saved_previews:
+                self.image_tiles = None
+                self.image_checksum = None
+                self.save_hyperspy_preview(file_path)
 
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix='.tif'
-                ) as temp_file:
-                    temp_file.write(file_content)
-                    temp_file_path = temp_file.name
-                tif_file = hs.load(temp_file_path)
+        super().normalize(archive, logger)
 
-            png_file = os.path.splitext(image_file_name)[0] + '.png'
-            tif_file.save(png_file, overwrite=True)
-            self.image_preview = os.path.basename(png_file)
 
-        super().normalize(archive, logger)
+MASS_SPECTRUM_MAX_PLOT_POINTS = 5000
 
 
 class CE_NOME_Massspectrometry(Massspectrometry, EntryData, PlotSection):
@@ -1676,10 +2003,17 @@ class CE_NOME_Massspectrometry(Massspectrometry, EntryData, PlotSection):
                 'instruments',
                 'results',
             ],
-            properties=dict(order=['name', 'data_file']),
+            properties=dict(order=['name', 'data_file', 'max_plot_points']),
         )
     )
 
+    max_plot_points = Quantity(
+        type=int,
+        default=MASS_SPECTRUM_MAX_PLOT_POINTS,
+        description='Maximum number of points plotted per mass channel.',
+        a_eln=dict(component='NumberEditQuantity'),
+    )
+
     def normalize(self, archive, logger):
         # from datetime import datetime
         # self.method = "Vis Image"
@@ -1700,16 +2034,26 @@ class CE_NOME_Massspectrometry(Massspectrometry, EntryData, PlotSection):
             self.datetime = data.Time.iloc[0]
 
         if self.data and self.time:
-            import plotly.graph_objects as go
-
             result_figures = []
 
+            # the time axis is formatted once and shared by all channels, every
+            # channel is reduced to its extrema per bucket for the figure
+            time_labels = np.asarray(
+                pd.to_datetime(pd.Series(self.time)).dt.strftime('%Y-%m-%d %H:%M:%S')
+            )
+            max_plot_points = self.max_plot_points
+            if max_plot_points is None or max_plot_points < 1:
+                max_plot_points = MASS_SPECTRUM_MAX_PLOT_POINTS
             fig = go.Figure()
             for d in self.data:
+                spectrum_data = np.asarray(
+                    getattr(d.spectrum_data, 'magnitude', d.spectrum_data), dtype=float
+                )[: len(time_labels)]
+                indices = minmax_decimation_indices(spectrum_data, max_plot_points)
                 fig.add_trace(
                     go.Scatter(
-                        x=[r.strftime('%H:%M:%S') if r else None for r in self.time],
-                        y=d.spectrum_data,
+                        x=time_labels[indices],
+                        y=spectrum_data[indices],
                         name=d.chemical_name,
                     )
                 )
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+from collections import OrderedDict
 
 # from nomad.units import ureg
 from baseclasses.characterizations import (
@@ -57,23 +58,15 @@ from nomad.metainfo import (
 )
 
 from .utilities.ce_nsli_id import CENSLIIdentifier
+from .utilities.lab_ids import reserve_lab_id_numbers
 
 m_package = SchemaPackage()
 
 
 def find_id(archive, lab_id, method):
-    from nomad.search import search
-
-    i = 1
-    while True:
-        next_lab_id = f'{lab_id}_{method}{i}'
-        query = {'results.eln.lab_ids': next_lab_id}
-        search_result = search(
-            owner='all', query=query, user_id=archive.metadata.main_author.user_id
-        )
-        if len(search_result.data) == 0:
-            return next_lab_id
-        i += 1
+    prefix = f'{lab_id}_{method}'
+    number = reserve_lab_id_numbers(archive, prefix)
+    return f'{lab_id}_{method}{number}'
 
 
 def assign_id(obj, archive, method):
@@ -86,33 +79,101 @@ def assign_id(obj, archive, method):
         obj.lab_id = find_id(archive, obj.solution[0].solution.lab_id, method)
 
 
-def get_processes(archive, entry_id, lab_id):
-    from nomad import files
-    from nomad.app.v1.models import MetadataPagination
+PROCESS_CACHE_SIZE = 256
+# referencing entries can be of any type, so only the schema independent ELN
+# results are requested
+PROCESS_SEARCH_REQUIRED = [
+    'entry_id',
+    'entry_name',
+    'results.eln.lab_ids',
+    'results.eln.names',
+]
+REFERENCING_STATE_REQUIRED = ['entry_id', 'complete_time']
+_process_cache = OrderedDict()
+
+
+def search_referencing_entries(archive, entry_id, required, pagination):
+    from nomad.app.v1.models import MetadataRequired
     from nomad.search import search
 
-    # search for all archives referencing this archive
-    query = {
-        'entry_references.target_entry_id': entry_id,
-    }
-    pagination = MetadataPagination()
-    pagination.page_size = 100
-    search_result = search(
+    return search(
         owner='all',
-        query=query,
+        query={'entry_references.target_entry_id': entry_id},
         pagination=pagination,
+        required=MetadataRequired(include=required),
         user_id=archive.metadata.main_author.user_id,
     )
+
+
+def get_referencing_state(archive, entry_id):
+    """
+    Returns the number of entries referencing `entry_id` and the time the last of
+    them was processed, which changes whenever a referencing entry changes.
+    """
+    from nomad.app.v1.models import MetadataPagination
+
+    pagination = MetadataPagination(page_size=1, order_by='complete_time', order='desc')
+    search_result = search_referencing_entries(
+        archive, entry_id, REFERENCING_STATE_REQUIRED, pagination
+    )
+    last_time = (
+        search_result.data[0].get('complete_time') if search_result.data else None
+    )
+    return search_result.pagination.total, last_time
+
+
+def get_process(entry, lab_id):
+    """
+    Returns the lab id starting with `lab_id` and the name of a referencing entry.
+    The ELN results collect the lab ids and names of all sections of the entry in
+    no guaranteed order, so a name is only taken from the same position as the lab
+    id if both lists have the same length. Otherwise the entry name is used.
+    """
+    eln = entry.get('results', {}).get('eln', {})
+    lab_ids = eln.get('lab_ids') or []
+    names = eln.get('names') or []
+    for index, process_lab_id in enumerate(lab_ids):
+        if process_lab_id and process_lab_id.startswith(lab_id):
+            name = names[index] if len(names) == len(lab_ids) else None
+            return process_lab_id, name or entry.get('entry_name')
+    return None
+
+
+def get_processes(archive, entry_id, lab_id):
+    """
+    Returns the sorted lab ids and names of all entries referencing `entry_id`
+    that have a lab id starting with `lab_id`. Both are taken from the ELN results
+    in the search index. The result is cached per entry until the set of
+    referencing entries or one of them changes.
+    """
+    from nomad.app.v1.models import MetadataPagination
+
+    state = get_referencing_state(archive, entry_id)
+    cached = _process_cache.get((entry_id, lab_id))
+    if cached is not None and cached[0] == state:
+        _process_cache.move_to_end((entry_id, lab_id))
+        return cached[1]
+
+    pagination = MetadataPagination(page_size=1000)
     processes = []
-    for res in search_result.data:
-        with files.UploadFiles.get(upload_id=res['upload_id']).read_archive(
-            entry_id=res['entry_id']
-        ) as archive_entry:
-            entry_id = res['entry_id']
-            entry_data = archive_entry[entry_id]['data']
-            if 'lab_id' in entry_data and entry_data.get('lab_id').startswith(lab_id):
-                processes.append((entry_data.get('lab_id'), entry_data.get('name')))
-    return sorted(processes, key=lambda pair: pair[0])
+    while True:
+        search_result = search_referencing_entries(
+            archive, entry_id, PROCESS_SEARCH_REQUIRED, pagination
+        )
+        for entry in search_result.data:
+            process = get_process(entry, lab_id)
+            if process is not None:
+                processes.append(process)
+        next_page = search_result.pagination.next_page_after_value
+        if not next_page or not search_result.data:
+            break
+        pagination.page_after_value = next_page
+
+    processes = sorted(processes, key=lambda pair: pair[0])
+    _process_cache[(entry_id, lab_id)] = (state, processes)
+    while len(_process_cache) > PROCESS_CACHE_SIZE:
+        _process_cache.popitem(last=False)
+    return processes
 
 
 # %% ####################### Entities
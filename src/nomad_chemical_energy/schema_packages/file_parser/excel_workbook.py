@@ -0,0 +1,183 @@
+# MIT License
+
+# Copyright (c) 2019
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import zipfile
+from functools import lru_cache
+from xml.etree import ElementTree
+
+import pandas as pd
+
+
+def get_excel_engine():
+    """
+    Returns 'calamine' if python-calamine is installed and supported by pandas,
+    otherwise None so that pandas falls back to its default engine (openpyxl).
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    if (major, minor) < (2, 2):
+        return None
+    return 'calamine'
+
+
+OFFICE_DOCUMENT_RELATIONSHIP = (
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+)
+
+
+def _get_local_tag(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def _get_workbook_part(zip_file):
+    """
+    Returns the path of the workbook part in the zip container, as declared by the
+    package relationships in `_rels/.rels`.
+    """
+    with zip_file.open('_rels/.rels') as rels_xml:
+        root = ElementTree.parse(rels_xml).getroot()
+    for element in root.iter():
+        if (
+            _get_local_tag(element) == 'Relationship'
+            and element.get('Type') == OFFICE_DOCUMENT_RELATIONSHIP
+        ):
+            return element.get('Target', '').lstrip('/')
+    raise KeyError('no officeDocument relationship')
+
+
+def _read_sheet_names_with_openpyxl(filename):
+    import openpyxl
+
+    try:
+        workbook = openpyxl.load_workbook(filename, read_only=True)
+    except Exception:
+        return ()
+    try:
+        return tuple(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+@lru_cache(maxsize=256)
+def _read_xlsx_sheet_names(filename, mtime_ns, size):
+    try:
+        with zipfile.ZipFile(filename) as zip_file:
+            with zip_file.open(_get_workbook_part(zip_file)) as workbook_xml:
+                root = ElementTree.parse(workbook_xml).getroot()
+    except (OSError, zipfile.BadZipFile):
+        return ()
+    except (KeyError, ElementTree.ParseError):
+        # unusual package layout, let openpyxl resolve it
+        return _read_sheet_names_with_openpyxl(filename)
+    return tuple(
+        element.get('name')
+        for element in root.iter()
+        if _get_local_tag(element) == 'sheet'
+    )
+
+
+def get_xlsx_sheet_names(filename):
+    """
+    Returns the sheet names of an xlsx file by only reading the workbook part, as
+    declared in `_rels/.rels`, from the zip container. Falls back to openpyxl if the
+    part cannot be resolved. Returns an empty tuple if the file is not a valid xlsx
+    file.
+    Results are cached per file and modification time, so a parser can call this in
+    `is_mainfile` and `parse` without reading the file twice.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return ()
+    return _read_xlsx_sheet_names(filename, stat.st_mtime_ns, stat.st_size)
+
+
+def columns_starting_with(prefixes):
+    """
+    Returns a `usecols` callable that keeps all string columns starting with one of
+    the given prefixes.
+    """
+    prefixes = tuple(prefixes)
+
+    def _usecols(column):
+        return isinstance(column, str) and column.startswith(prefixes)
+
+    _usecols.prefixes = prefixes
+    return _usecols
+
+
+def _cache_key(sheet_name, kwargs):
+    key = []
+    for name, value in sorted(kwargs.items()):
+        if isinstance(value, list):
+            key.append((name, tuple(value)))
+        elif callable(value):
+            key.append((name, getattr(value, 'prefixes', value)))
+        else:
+            key.append((name, value))
+    return sheet_name, tuple(key)
+
+
+class ExcelWorkbook:
+    """
+    Opens an Excel workbook once and caches every parsed sheet, so that all readers
+    of one normalize share a single load of the file.
+    """
+
+    def __init__(self, file_obj, engine=None):
+        self.engine = engine or get_excel_engine()
+        self.excel_file = pd.ExcelFile(file_obj, engine=self.engine)
+        self._frames = {}
+
+    @property
+    def sheet_names(self):
+        return self.excel_file.sheet_names
+
+    def read_sheet(self, sheet_name, **kwargs):
+        return self.read_sheets({sheet_name: kwargs})[sheet_name]
+
+    def read_sheets(self, sheets):
+        """
+        Reads several sheets at once. `sheets` maps the sheet name to the keyword
+        arguments of `pd.read_excel` (e.g. `header`, `index_col`, `usecols`).
+        Sheets sharing the same arguments are parsed in a single call. A copy of the
+        cached frame is returned, so callers may modify it in place.
+        """
+        missing = {}
+        for sheet_name, kwargs in sheets.items():
+            key = _cache_key(sheet_name, kwargs)
+            if key not in self._frames:
+                missing.setdefault(key[1], (kwargs, []))[1].append(sheet_name)
+
+        for kwargs_key, (kwargs, sheet_names) in missing.items():
+            frames = pd.read_excel(self.excel_file, sheet_name=sheet_names, **kwargs)
+            for sheet_name, frame in frames.items():
+                self._frames[(sheet_name, kwargs_key)] = frame
+
+        return {
+            sheet_name: self._frames[_cache_key(sheet_name, kwargs)].copy()
+            for sheet_name, kwargs in sheets.items()
+        }
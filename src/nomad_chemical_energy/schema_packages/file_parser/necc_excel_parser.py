@@ -21,8 +21,10 @@
 # SOFTWARE.
 
 import re
+import time
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from baseclasses.chemical_energy import (
     CENECCElectrode,
@@ -225,16 +227,63 @@ def read_results_data(data, pH_start=None, ph_end=None):
     return results_data
 
 
-def extract_properties(file):
+def get_summary_metrics(results_df, gas_types, steady_state_start=0):
+    """
+    Computes the summary metrics of an EC-GC experiment from its results table with
+    the columns 'datetime', 'cell_current' (mA), 'cell_voltage' (V) and one faradaic
+    efficiency column (%) per gas type. Only rows at least `steady_state_start`
+    minutes after the first injection are used, unless fewer than two remain.
+    """
+    results_df = results_df.dropna(subset=['datetime']).sort_values('datetime')
+    if results_df.empty:
+        return {}
+    minutes = (
+        results_df['datetime'] - results_df['datetime'].iloc[0]
+    ).dt.total_seconds().to_numpy() / 60
+    steady_state = minutes >= steady_state_start
+    if steady_state.sum() < 2:
+        steady_state[:] = True
+    results_df = results_df[steady_state]
+    hours = minutes[steady_state] / 60
+
+    metrics = {}
+    gas_columns = [gas for gas in gas_types if gas in results_df]
+    fe_stats = results_df[gas_columns].agg(['mean', 'min', 'max'])
+    for gas in gas_columns:
+        for stat in ('mean', 'min', 'max'):
+            if pd.notna(fe_stats.at[stat, gas]):
+                metrics[f'{gas.lower()}_{stat}_fe'] = fe_stats.at[stat, gas]
+
+    for name in ('cell_current', 'cell_voltage'):
+        if name not in results_df:
+            continue
+        valid = results_df[name].notna().to_numpy()
+        if not valid.any():
+            continue
+        values = results_df[name].to_numpy()[valid]
+        valid_hours = hours[valid]
+        if len(values) > 1 and np.ptp(valid_hours) > 0:
+            # time-weighted (trapezoidal) mean
+            metrics[f'mean_{name}'] = np.sum(
+                np.diff(valid_hours) * (values[1:] + values[:-1]) / 2
+            ) / np.ptp(valid_hours)
+        else:
+            metrics[f'mean_{name}'] = values.mean()
+        if name == 'cell_voltage' and len(values) > 1 and np.ptp(valid_hours) > 0:
+            metrics['cell_voltage_drift'] = np.polyfit(valid_hours, values * 1000, 1)[0]
+    return metrics
+
+
+def extract_properties(workbook):
     table_name = next(
         (
             name
             for name in ['Experimental details', 'Experimental Details']
-            if name in file.sheet_names
+            if name in workbook.sheet_names
         ),
         None,
     )
-    data_sheet = pd.read_excel(file, sheet_name=table_name, index_col=0, header=None)
+    data_sheet = workbook.read_sheet(table_name, index_col=0, header=None)
 
     if len(data_sheet.columns) == 0:
         return {}
@@ -384,69 +433,239 @@ def _get_electrode_recipe(data_series, recipe_type):
     return recipe
 
 
+NECC_PACKAGE = 'nomad_chemical_energy.schema_packages.ce_necc_package'
+ENTRY_HASH_INDEX_TTL = 600  # seconds
+SHARED_UPLOAD_MEMO_TTL = 60  # seconds
+
+
+class _EntryHashIndex:
+    """
+    Per-process index of `entry_dict_hash` -> entry ids of the electrode recipes and
+    electrodes in a shared upload, as visible to a user. It is warmed with one paged
+    search of that upload and expires after `ttl` seconds, so bulk processing does
+    not search once per electrode.
+    """
+
+    entry_types = ('CE_NECC_ElectrodeRecipe', 'CE_NECC_Electrode')
+
+    def __init__(self, ttl=ENTRY_HASH_INDEX_TTL):
+        self.ttl = ttl
+        self._indices = {}
+
+    def _is_fresh(self, key):
+        index = self._indices.get(key)
+        return index is not None and time.monotonic() - index[0] < self.ttl
+
+    def _warm(self, user_id, upload_id):
+        from nomad.app.v1.models import MetadataPagination, MetadataRequired
+        from nomad.search import search
+
+        hashes = {entry_type: {} for entry_type in self.entry_types}
+        pagination = MetadataPagination()
+        pagination.page_size = 1000
+        pagination.order_by = 'entry_create_time'
+        pagination.order = 'asc'
+        required = MetadataRequired()
+        required.include = ['entry_type', 'upload_id', 'entry_id'] + [
+            f'data.{quantity}#{NECC_PACKAGE}.{entry_type}'
+            for entry_type in self.entry_types
+            for quantity in ('entry_dict_hash', 'lab_id')
+        ]
+        while True:
+            search_result = search(
+                owner='all',
+                query={
+                    'upload_id': upload_id,
+                    'entry_type:any': list(self.entry_types),
+                },
+                user_id=user_id,
+                pagination=pagination,
+                required=required,
+            )
+            for entry in search_result.data:
+                data = entry.get('data', {})
+                if entry.get('entry_type') in hashes and data.get('entry_dict_hash'):
+                    # ordered by creation time, so the newest entry wins
+                    hashes[entry['entry_type']][data['entry_dict_hash']] = {
+                        'upload_id': entry.get('upload_id'),
+                        'entry_id': entry.get('entry_id'),
+                        'lab_id': data.get('lab_id'),
+                    }
+            next_page_after_value = search_result.pagination.next_page_after_value
+            if not next_page_after_value:
+                break
+            pagination.page_after_value = next_page_after_value
+        self._indices[(user_id, upload_id)] = (time.monotonic(), hashes)
+
+    def lookup(self, user_id, upload_id, entry_type, entry_dict_hash):
+        """
+        Returns the ids of the entry with `entry_dict_hash` in the shared upload
+        `upload_id`, or None if it is unknown or the index could not be built.
+        """
+        from nomad import utils
+
+        if upload_id is None:
+            return None
+        key = (user_id, upload_id)
+        if not self._is_fresh(key):
+            try:
+                self._warm(user_id, upload_id)
+            except Exception as e:
+                self._indices.pop(key, None)
+                utils.get_logger(__name__).warning(
+                    'could not build the entry hash index, searching per hash',
+                    upload_id=upload_id,
+                    exc_info=e,
+                )
+                return None
+        return self._indices[key][1][entry_type].get(entry_dict_hash)
+
+    def add(self, user_id, upload_id, entry_type, entry_dict_hash, entry_id):
+        key = (user_id, upload_id)
+        if not self._is_fresh(key) or not entry_dict_hash:
+            return
+        self._indices[key][1].setdefault(entry_type, {})[entry_dict_hash] = {
+            'upload_id': upload_id,
+            'entry_id': entry_id,
+            'lab_id': None,
+        }
+
+
+_entry_hash_index = _EntryHashIndex()
+
+
+_shared_upload_memo = {}
+
+
 def _get_shared_upload_id(archive, entry_type, base_id=None):
-    from nomad.app.v1.models import MetadataPagination, MetadataRequired
+    """
+    Returns the upload that holds most entries of `entry_type` (with `base_id` in
+    their lab id). The counts are computed by a terms aggregation on `upload_id` and
+    the winner is memoized for `SHARED_UPLOAD_MEMO_TTL` seconds.
+    """
+    from elasticsearch_dsl import Q
+    from nomad.app.v1.models import (
+        Aggregation,
+        MetadataPagination,
+        TermsAggregation,
+    )
     from nomad.search import search
 
-    query = {'entry_type': entry_type}
+    user_id = archive.metadata.main_author.user_id
+    memo_key = (user_id, entry_type, base_id)
+    memo = _shared_upload_memo.get(memo_key)
+    if memo is not None and time.monotonic() - memo[0] < SHARED_UPLOAD_MEMO_TTL:
+        return memo[1]
+
+    query = Q('term', entry_type=entry_type)
+    if base_id:
+        query &= Q('wildcard', **{'results.eln.lab_ids': f'*{base_id}*'})
     pagination = MetadataPagination()
-    pagination.page_size = 1000
-    required = MetadataRequired()
-    required.include = (
-        ['upload_id', 'results.eln.lab_ids'] if base_id else ['upload_id']
-    )
+    pagination.page_size = 0
     search_result = search(
         owner='all',
         query=query,
-        user_id=archive.metadata.main_author.user_id,
+        user_id=user_id,
         pagination=pagination,
-        required=required,
+        aggregations={
+            'uploads': Aggregation(terms=TermsAggregation(quantity='upload_id', size=1))
+        },
     )
-    if len(search_result.data) >= 1:
-        upload_counts = {}
-        for entry in search_result.data:
-            if (
-                base_id
-                and base_id
-                not in entry.get('results', {}).get('eln', {}).get('lab_ids', [''])[0]
-            ):
-                continue
-            upload_counts[entry.get('upload_id')] = (
-                upload_counts.get(entry.get('upload_id'), 0) + 1
-            )
-        if upload_counts:
-            return max(upload_counts, key=upload_counts.get)
-    return None
-
-
-def _write_entry_to_upload(entry_def, entry, upload_id, file_name, overwrite=False):
-    import json
-
-    from nomad import files
-    from nomad.processing import Upload
+    # buckets are ordered by their count, the first one is the largest upload
+    buckets = search_result.aggregations['uploads'].terms.data
+    upload_id = buckets[0].value if buckets else None
+    if upload_id is not None:
+        _shared_upload_memo[memo_key] = (time.monotonic(), upload_id)
+    return upload_id
+
+
+class _EntryWriteBuffer:
+    """
+    Collects the new recipe and electrode entries created during one normalize and
+    writes them to their shared uploads in one go. All files of an upload are
+    written before the first one is processed.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self._entries = {}
+
+    def add(self, entry_def, entry, upload_id, file_name):
+        """
+        Queues the entry as `file_name` in the upload `upload_id`. Returns False if the
+        file already exists in the upload or a different entry was already queued
+        under the same file name. Queuing an identical entry twice is a no-op.
+        """
+        from nomad import files
+        from nomad.utils import hash
 
-    if (
-        not files.UploadFiles.get(upload_id=upload_id).raw_path_exists(file_name)
-        or overwrite
-    ):
         entry_dict = entry.m_to_dict(with_root_def=False)
         entry_dict['m_def'] = entry_def
-        with files.UploadFiles.get(upload_id=upload_id).raw_file(
-            file_name, 'w'
-        ) as outfile:
-            json.dump({'data': entry_dict}, outfile)
-        Upload.get(upload_id).process_updated_raw_file(
-            file_name, allow_modify=overwrite
+        queued_entries = self._entries.setdefault(upload_id, {})
+        if file_name in queued_entries:
+            return queued_entries[file_name] == entry_dict
+        if files.UploadFiles.get(upload_id=upload_id).raw_path_exists(file_name):
+            return False
+        queued_entries[file_name] = entry_dict
+        _entry_hash_index.add(
+            self.archive.metadata.main_author.user_id,
+            upload_id,
+            entry_def.rsplit('.', 1)[-1],
+            getattr(entry, 'entry_dict_hash', None),
+            hash(upload_id, file_name),
         )
         return True
-    else:
-        return False
 
+    def flush(self):
+        """
+        Writes all queued files and processes them synchronously, so that the
+        entries referencing them find their targets once this returns.
+
+        The files are still processed one by one: `Upload.process_upload` would
+        process all of them in one call, but it runs asynchronously and fails while
+        the shared upload is being processed by another worker, so the references
+        would not resolve within this normalize.
+        """
+        import json
 
-def _get_id_for_entry_hash(archive, entry_type, entry_dict_hash):
+        from nomad import files
+        from nomad.processing import Upload
+
+        for upload_id, queued_entries in self._entries.items():
+            if not queued_entries:
+                continue
+            upload = Upload.get(upload_id)
+            upload_files = files.UploadFiles.get(upload_id=upload_id)
+            for file_name, entry_dict in queued_entries.items():
+                with upload_files.raw_file(file_name, 'w') as outfile:
+                    json.dump({'data': entry_dict}, outfile)
+            for file_name in queued_entries:
+                upload.process_updated_raw_file(file_name, allow_modify=False)
+        self._entries = {}
+
+
+def _get_id_for_entry_hash(archive, entry_type, entry_dict_hash, upload_id):
+    """
+    Returns the ids (the lab id for electrodes) of the newest entry of `entry_type`
+    with `entry_dict_hash`. The shared upload `upload_id` is looked up in the index
+    first, all other uploads are searched per hash.
+    """
     from nomad.app.v1.models import MetadataPagination, MetadataRequired
     from nomad.search import search
 
+    ref_id = _entry_hash_index.lookup(
+        archive.metadata.main_author.user_id, upload_id, entry_type, entry_dict_hash
+    )
+    if ref_id is not None:
+        if entry_type != 'CE_NECC_Electrode':
+            return ref_id
+        if ref_id.get('lab_id'):
+            return ref_id['lab_id']
+        # lab ids of electrodes written in this process are only known after
+        # they were processed, fall back to the search
+    # a miss falls back to the search as well, the entry might have been created
+    # by another worker after the index was built
+
     query = {
         'entry_type': entry_type,
         f'data.entry_dict_hash#nomad_chemical_energy.schema_packages.ce_necc_package.{entry_type}': entry_dict_hash,
@@ -475,7 +694,7 @@ def _get_id_for_entry_hash(archive, entry_type, entry_dict_hash):
     return None
 
 
-def _get_electrode_recipe_reference(recipe_type, data_series, archive):
+def _get_electrode_recipe_reference(recipe_type, data_series, archive, write_buffer):
     recipe_entry_id = None
     recipe_upload_id = None
     if data_series.get('recipe id'):
@@ -487,18 +706,21 @@ def _get_electrode_recipe_reference(recipe_type, data_series, archive):
         electrode_recipe_entry = _get_electrode_recipe(data_series, recipe_type)
         # check if recipe already exists
         electrode_recipe_entry.set_entry_dict_hash()
+        recipe_upload_id = _get_shared_upload_id(archive, 'CE_NECC_ElectrodeRecipe')
         ref_id = _get_id_for_entry_hash(
-            archive, 'CE_NECC_ElectrodeRecipe', electrode_recipe_entry.entry_dict_hash
+            archive,
+            'CE_NECC_ElectrodeRecipe',
+            electrode_recipe_entry.entry_dict_hash,
+            recipe_upload_id,
         )
         if ref_id:
             return get_reference(
                 ref_id.get('upload_id', ''), ref_id.get('entry_id', '')
             )
         # create new recipe if no identical recipe exists yet
-        recipe_upload_id = _get_shared_upload_id(archive, 'CE_NECC_ElectrodeRecipe')
         recipe_file_name = f'{electrode_recipe_entry.name}.archive.json'
         entry_def = 'nomad_chemical_energy.schema_packages.ce_necc_package.CE_NECC_ElectrodeRecipe'
-        new_recipe_written = _write_entry_to_upload(
+        new_recipe_written = write_buffer.add(
             entry_def, electrode_recipe_entry, recipe_upload_id, recipe_file_name
         )
         if not new_recipe_written:
@@ -512,7 +734,9 @@ def _get_electrode_recipe_reference(recipe_type, data_series, archive):
     return None
 
 
-def _get_electrode_comp_system_reference(archive, electrode_data, electrode_type):
+def _get_electrode_comp_system_reference(
+    archive, electrode_data, electrode_type, write_buffer
+):
     reuse_existing = electrode_data.get('already used in other\nexperiment? (y/n)')
     if electrode_type == 'anode':
         recipe_type = 'Anode Recipe (AR)'
@@ -521,18 +745,21 @@ def _get_electrode_comp_system_reference(archive, electrode_data, electrode_type
         recipe_type = 'Cathode Recipe (CR)'
         base_id = '_CR_'
     electrode_recipe_ref = _get_electrode_recipe_reference(
-        recipe_type, electrode_data, archive
+        recipe_type, electrode_data, archive, write_buffer
     )
     electrode_entry = get_electrode(electrode_data, electrode_recipe_ref)
+    electrode_upload_id = _get_shared_upload_id(archive, 'CE_NECC_Electrode', base_id)
     if reuse_existing == 'y':
         electrode_entry.set_entry_dict_hash()
         ref_lab_id = _get_id_for_entry_hash(
-            archive, 'CE_NECC_Electrode', electrode_entry.entry_dict_hash
+            archive,
+            'CE_NECC_Electrode',
+            electrode_entry.entry_dict_hash,
+            electrode_upload_id,
         )
         if ref_lab_id:
             return CompositeSystemReference(lab_id=ref_lab_id)
         return None
-    electrode_upload_id = _get_shared_upload_id(archive, 'CE_NECC_Electrode', base_id)
     date_str = (
         f'_{electrode_entry.electrode_id.datetime.strftime("%Y%m%d")}'
         if electrode_entry.electrode_id.datetime
@@ -545,7 +772,7 @@ def _get_electrode_comp_system_reference(archive, electrode_data, electrode_type
     entry_def = (
         'nomad_chemical_energy.schema_packages.ce_necc_package.CE_NECC_Electrode'
     )
-    new_electrode_written = _write_entry_to_upload(
+    new_electrode_written = write_buffer.add(
         entry_def, electrode_entry, electrode_upload_id, electrode_file_name
     )
     if not new_electrode_written:
@@ -572,26 +799,23 @@ def get_electrode(data_series, recipe_reference):
     return electrode
 
 
-def set_catalyst_details(archive, file):
-    data_sheet = pd.read_excel(
-        file,
-        sheet_name='Catalyst details',
-        index_col=0,
-        header=None,
-    )
+def set_catalyst_details(archive, workbook):
+    data_sheet = workbook.read_sheet('Catalyst details', index_col=0, header=None)
 
     if len(data_sheet.columns) == 0:
         return {}
 
     # normalize keys (different capitalization in different versions of excel template)
     data_sheet.index = data_sheet.index.str.strip().str.lower()
+    write_buffer = _EntryWriteBuffer(archive)
     if archive.data.properties.cathode is None:
         cathode_data = data_sheet[1].dropna()
         archive.data.properties.cathode = _get_electrode_comp_system_reference(
-            archive, cathode_data, 'cathode'
+            archive, cathode_data, 'cathode', write_buffer
         )
     if archive.data.properties.anode is None:
         anode_data = data_sheet[4].dropna()
         archive.data.properties.anode = _get_electrode_comp_system_reference(
-            archive, anode_data, 'anode'
+            archive, anode_data, 'anode', write_buffer
         )
+    write_buffer.flush()
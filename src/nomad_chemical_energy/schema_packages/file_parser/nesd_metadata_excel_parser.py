@@ -20,6 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import json
 import re
 
 from baseclasses import PubChemPureSubstanceSectionCustom
@@ -144,6 +145,19 @@ def get_reference_electrode(data_dict):
     return entry
 
 
+def get_shared_entity_file_name(entry, prefix):
+    """
+    Returns a file name derived from the content of `entry`. Identical definitions
+    from the metadata excel files of different folders get the same file name, so
+    the entity is written once per upload and referenced by all of them.
+    """
+    from nomad.utils import hash
+
+    entry_dict = entry.m_to_dict(with_root_def=True)
+    content_hash = hash(json.dumps(entry_dict, sort_keys=True, default=str))
+    return f'{prefix}_{content_hash}.archive.json'
+
+
 def map_setup(entry, data_dict):
     entry.origin = data_dict.get('Experimentalist: Name')
     if data_dict.get('Measurement Date'):
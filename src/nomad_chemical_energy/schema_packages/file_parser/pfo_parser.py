@@ -1,20 +1,64 @@
-from io import StringIO
-
 import pandas as pd
 
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    ExcelWorkbook,
+)
+from nomad_chemical_energy.schema_packages.file_parser.sensor_log_parser import (
+    locate_header,
+    read_sensor_log,
+)
+
+PFO_DATE_COLUMN = 'Date [mm/dd/yyyy]'
+
+
+def locate_pfo_header(file_obj):
+    """
+    Moves `file_obj` to the header line of a phase fluorometry csv export. Raises a
+    ValueError if the file has no such line.
+    """
+    if locate_header(file_obj, f'"{PFO_DATE_COLUMN}";') is None:
+        raise ValueError(
+            f'no header line with the column "{PFO_DATE_COLUMN}" found in the '
+            'phase fluorometry csv file'
+        )
+
 
 def get_pfo_measurement_csv(file_obj):
-    file_data = file_obj.read()
-    lookup = '"Date [mm/dd/yyyy]";'
-    for num, line in enumerate(file_data.split('\n')):
-        if lookup in line:
-            break
-    data = pd.read_csv(StringIO(file_data), sep=';', header=num, skip_blank_lines=False)
-    return data
+    locate_pfo_header(file_obj)
+    return read_sensor_log(file_obj, sep=';')
+
+
+def get_pfo_datetimes(data):
+    """
+    Returns the datetimes of the rows of a phase fluorometry csv export from its
+    date and time columns, or None if the columns are missing.
+    """
+    time_column = next(
+        (column for column in data.columns if str(column).startswith('Time')), None
+    )
+    if PFO_DATE_COLUMN not in data.columns or time_column is None:
+        return None
+    return pd.to_datetime(
+        data[PFO_DATE_COLUMN].astype(str) + ' ' + data[time_column].astype(str),
+        format='%m/%d/%Y %H:%M:%S',
+        errors='coerce',
+    )
+
+
+def get_pfo_seconds(data):
+    """
+    Returns the seconds since the first row of a phase fluorometry csv export, or
+    None if the date and time columns are missing.
+    """
+    datetimes = get_pfo_datetimes(data)
+    if datetimes is None:
+        return None
+    return (datetimes - datetimes.min()).dt.total_seconds().to_numpy()
 
 
 def get_pfo_measurement_xlsx(file_obj):
-    dfs = pd.read_excel(file_obj, sheet_name=None)
-    for key, df in dfs.items():
-        if 'Oxygen Concentration' in df.columns:
-            return df
+    workbook = ExcelWorkbook(file_obj)
+    for sheet_name in workbook.sheet_names:
+        # only the header row is needed to find the oxygen sheet
+        if 'Oxygen Concentration' in workbook.read_sheet(sheet_name, nrows=0).columns:
+            return workbook.read_sheet(sheet_name)
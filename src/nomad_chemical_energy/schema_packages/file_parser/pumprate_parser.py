@@ -1,12 +1,26 @@
-import pandas as pd
+from nomad_chemical_energy.schema_packages.file_parser.sensor_log_parser import (
+    read_sensor_log,
+)
 
+PUMP_RATE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
 
-def get_pump_rate_measurement_csv(file_obj):
-    data = pd.read_csv(file_obj, sep=';', header=0, skip_blank_lines=False)
 
+def get_pump_rate_datetimes(data):
     from baseclasses.helper.utilities import lookup
 
-    data['time'] = lookup(data.iloc[:, 0], format='%Y-%m-%d %H:%M:%S.%f')
+    return lookup(data.iloc[:, 0], format=PUMP_RATE_TIME_FORMAT)
+
+
+def set_pump_rate_durations(data):
+    """
+    Adds the time of every row and the duration since the first row to a pump rate
+    log, which may already be aggregated over time buckets.
+    """
+    data['time'] = get_pump_rate_datetimes(data)
     data['duration'] = data.time - data.time.iloc[0]
     data['duration_s'] = data.duration.dt.total_seconds()
     return data
+
+
+def get_pump_rate_measurement_csv(file_obj):
+    return set_pump_rate_durations(read_sensor_log(file_obj, sep=';'))
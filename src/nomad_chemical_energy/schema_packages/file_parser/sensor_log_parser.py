@@ -0,0 +1,80 @@
+import pandas as pd
+
+SENSOR_LOG_CHUNK_SIZE = 100_000
+SENSOR_LOG_SAMPLE_ROWS = 1000
+
+
+def locate_header(file_obj, lookup):
+    """
+    Reads `file_obj` line by line until a line contains `lookup` and moves the file
+    back to the start of that line. Returns the line number, or None if no line
+    matches, in which case the file is moved back to where it was.
+    """
+    start = file_obj.tell()
+    num = 0
+    while True:
+        position = file_obj.tell()
+        line = file_obj.readline()
+        if not line:
+            file_obj.seek(start)
+            return None
+        if lookup in line:
+            file_obj.seek(position)
+            return num
+        num += 1
+
+
+def get_sample_dtypes(file_obj, sep):
+    """
+    Infers the column types from the first rows after the current position.
+    Numeric columns are read as float, so missing values do not change their type.
+    """
+    position = file_obj.tell()
+    sample = pd.read_csv(
+        file_obj, sep=sep, nrows=SENSOR_LOG_SAMPLE_ROWS, skip_blank_lines=False
+    )
+    file_obj.seek(position)
+    return {
+        column: 'float64' if pd.api.types.is_numeric_dtype(dtype) else 'object'
+        for column, dtype in sample.dtypes.items()
+    }
+
+
+def iter_sensor_log(file_obj, sep=';', chunk_size=SENSOR_LOG_CHUNK_SIZE, logger=None):
+    """
+    Yields a sensor log from the current position of `file_obj` in chunks, with the
+    column types fixed after the first rows, so all chunks have the same types.
+    Values that do not fit a numeric column are read as NaN, their number per
+    column is logged as a warning once the whole log was read.
+    """
+    dtypes = get_sample_dtypes(file_obj, sep)
+    coerced = {}
+    chunks = pd.read_csv(
+        file_obj,
+        sep=sep,
+        dtype={column: dtype for column, dtype in dtypes.items() if dtype == 'object'},
+        chunksize=chunk_size,
+        skip_blank_lines=False,
+    )
+    for chunk in chunks:
+        for column, dtype in dtypes.items():
+            if dtype == 'float64' and chunk[column].dtype != dtype:
+                values = pd.to_numeric(chunk[column], errors='coerce').astype(dtype)
+                num_coerced = int((values.isna() & chunk[column].notna()).sum())
+                if num_coerced:
+                    coerced[column] = coerced.get(column, 0) + num_coerced
+                chunk[column] = values
+        yield chunk
+    if logger is not None and coerced:
+        logger.warning(
+            'non-numeric values in numeric sensor log columns were read as NaN',
+            coerced_values=coerced,
+        )
+
+
+def read_sensor_log(file_obj, sep=';', logger=None):
+    """
+    Reads a whole sensor log from the current position of `file_obj`. Long logs
+    should be aggregated chunk by chunk from `iter_sensor_log` instead.
+    """
+    return pd.concat(iter_sensor_log(file_obj, sep, logger=logger), ignore_index=True)
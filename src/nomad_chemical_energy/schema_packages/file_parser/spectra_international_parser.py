@@ -1,4 +1,3 @@
-import numpy as np
 import pandas as pd
 
 
@@ -23,10 +22,11 @@ def parse_spectrum(f):
         key, value = line.split('\t')
         metadata.update({key.strip().strip('"'): to_float(value.strip().strip('"'))})
 
-    data = pd.read_csv(f, sep='\t', header=0, on_bad_lines='skip')
+    data = pd.read_csv(
+        f, sep='\t', header=0, on_bad_lines='skip', na_values=['Skipped']
+    )
     data.Time = pd.to_datetime(data.Time, errors='coerce')
     data = data[pd.notnull(data.Time)]
-    data[data == 'Skipped'] = np.nan
     return metadata, data
 
 
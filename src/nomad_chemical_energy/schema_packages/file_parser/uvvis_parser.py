@@ -0,0 +1,38 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+UVVIS_FILE_EXTENSIONS = ('.ABS', '.csv')
+UVVIS_READ_WORKERS = 8
+
+
+def read_uvvis_file(f, extension):
+    """
+    Reads the wavelength and intensity columns of a UV-Vis export. The columns of
+    `.ABS` files are separated by a varying number of spaces, which pandas' C
+    engine handles as whitespace without falling back to the regex engine. Quoting
+    is disabled because the unbalanced quotes of the header would swallow a line.
+    """
+    if extension == '.ABS':
+        return pd.read_csv(
+            f, sep=r'\s+', header=None, skiprows=2, quoting=csv.QUOTE_NONE
+        )
+    return pd.read_csv(f, delimiter=',', header=None, skiprows=2)
+
+
+def read_uvvis_files(archive, data_files):
+    """
+    Reads all `data_files` from the upload in a thread pool and returns their data
+    frames in the same order.
+    """
+
+    def read(data_file):
+        with archive.m_context.raw_file(data_file, 'rt') as f:
+            return read_uvvis_file(f, os.path.splitext(data_file)[-1])
+
+    if len(data_files) < 2:
+        return [read(data_file) for data_file in data_files]
+    with ThreadPoolExecutor(max_workers=UVVIS_READ_WORKERS) as executor:
+        return list(executor.map(read, data_files))
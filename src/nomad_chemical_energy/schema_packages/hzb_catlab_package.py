@@ -29,43 +29,21 @@ from nomad.metainfo import Quantity, SchemaPackage, Section
 # from nomad_measurements.catalytic_measurement.catalytic_measurement import ReactionConditions
 from unidecode import unidecode
 
-m_package = SchemaPackage()
-
-
-def correct_lab_id(lab_id):
-    return lab_id[4:].isdigit() and len(lab_id[4:]) == 4
+from nomad_chemical_energy.schema_packages.utilities.lab_ids import (
+    reserve_lab_id_numbers,
+)
 
-
-def get_next_project_sample_number(data, entry_id):
-    """Check the lab ids of a project id for project_sample_number (last digits of lab_id) and returns the next higher one"""
-    project_sample_numbers = []
-    for entry in data:
-        lab_ids = entry['results']['eln']['lab_ids']
-        if entry['entry_id'] == entry_id and correct_lab_id(lab_ids[0]):
-            return int(lab_ids[0][4:])
-        project_sample_numbers.extend(
-            [int(lab_id[4:]) for lab_id in lab_ids if correct_lab_id(lab_id)]
-        )
-    return max(project_sample_numbers) + 1 if project_sample_numbers else 1
+m_package = SchemaPackage()
 
 
 def create_id(archive, lab_id_base):
-    from nomad.app.v1.models import MetadataPagination
-    from nomad.search import search
-
-    query = {'entry_type': 'CatLab_Sample', 'results.eln.lab_ids': lab_id_base}
-    pagination = MetadataPagination()
-    pagination.page_size = 9999
-    search_result = search(
-        owner='all',
-        query=query,
-        pagination=pagination,
-        user_id=archive.metadata.main_author.user_id,
-    )
-    project_sample_number = get_next_project_sample_number(
-        search_result.data, archive.metadata.entry_id
+    """
+    Reserves the next free `{lab_id_base}{number:04d}` among all CatLab samples.
+    Only called for samples without a lab id, existing ids are never renumbered.
+    """
+    project_sample_number = reserve_lab_id_numbers(
+        archive, lab_id_base, query={'entry_type': 'CatLab_Sample'}, digits=4
     )
-
     return f'{lab_id_base}{project_sample_number:04d}'
 
 
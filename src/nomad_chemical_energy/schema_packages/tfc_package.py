@@ -17,6 +17,7 @@
 #
 
 import os
+import re
 
 import numpy as np
 import pandas as pd
@@ -36,8 +37,48 @@ from nomad.datamodel.data import EntryData
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
 from nomad.metainfo import Datetime, Quantity, SchemaPackage, Section, SubSection
 
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    ExcelWorkbook,
+)
+
 m_package = SchemaPackage()
 
+
+# units of XRF composition columns, e.g. `At%`, `Mass %` or `at.%`
+XRF_PERCENT_UNIT_PATTERN = re.compile(r'[A-Za-z.]*\s*%')
+XRF_ATOMIC_PERCENT_PATTERN = re.compile(r'\bat(?:om|omic)?\.?\s*%', re.IGNORECASE)
+
+
+def is_atomic_percent(composition_name):
+    """
+    Returns whether an XRF composition column name is given in atomic percent,
+    e.g. 'Ti At%', as opposed to mass percent.
+    """
+    return XRF_ATOMIC_PERCENT_PATTERN.search(composition_name) is not None
+
+
+def get_element_symbol(composition_name):
+    """
+    Returns the chemical element symbol in an XRF composition column name, e.g.
+    'Ti' for 'Ti At%' or 'Layer Ti', or None. Only whole words are matched, and the
+    unit is ignored, so 'At%' is not taken for astatine.
+    """
+    from ase.data import chemical_symbols
+
+    name = XRF_PERCENT_UNIT_PATTERN.sub(' ', composition_name)
+    for word in re.findall(r'[A-Za-z]+', name):
+        # the first symbol is the placeholder `X`
+        if word in chemical_symbols[1:]:
+            return word
+    return None
+
+
+def get_position_hash(library_id, x, y):
+    from nomad.utils import hash
+
+    return hash(library_id, round(float(x), 5), round(float(y), 5))
+
+
 # %% ####################### Entities
 
 
@@ -149,10 +190,17 @@ class TFC_Sputtering(MultiTargetSputtering, PlotSection, EntryData):
     def normalize(self, archive, logger):
         if self.data_file:
             with archive.m_context.raw_file(self.data_file, 'rb') as f:
-                xls_file = pd.ExcelFile(f)
-                information_df = pd.read_excel(
-                    xls_file, sheet_name='Information', header=0, index_col=0
-                )
+                workbook = ExcelWorkbook(f)
+                sheets = {'Information': {'header': 0, 'index_col': 0}}
+                if not self.targets:
+                    sheets['Source_Configuration'] = {'header': 0}
+                if not self.process_properties:
+                    sheets['Parameters'] = {'header': 1, 'index_col': 0}
+                if not self.observables:
+                    sheets['Observables'] = {'header': 1, 'index_col': 0}
+                sheets = workbook.read_sheets(sheets)
+
+                information_df = sheets['Information']
                 information_values = information_df['Value'].where(
                     pd.notna(information_df['Value']), None
                 )
@@ -188,9 +236,7 @@ class TFC_Sputtering(MultiTargetSputtering, PlotSection, EntryData):
                         s.normalize(archive, logger)
 
                 if not self.targets:
-                    target_df = pd.read_excel(
-                        xls_file, sheet_name='Source_Configuration', header=0
-                    )
+                    target_df = sheets['Source_Configuration']
                     from baseclasses.helper.archive_builder.prevac_archive import (
                         get_target_properties,
                     )
@@ -198,9 +244,7 @@ class TFC_Sputtering(MultiTargetSputtering, PlotSection, EntryData):
                     self.targets = get_target_properties(target_df)
                 num_targets = len(self.targets)
                 if not self.process_properties:
-                    parameters_df = pd.read_excel(
-                        xls_file, sheet_name='Parameters', header=1, index_col=0
-                    )
+                    parameters_df = sheets['Parameters']
                     from baseclasses.helper.archive_builder.prevac_archive import (
                         get_process_properties,
                     )
@@ -209,9 +253,7 @@ class TFC_Sputtering(MultiTargetSputtering, PlotSection, EntryData):
                         parameters_df, num_targets
                     )
                 if not self.observables:
-                    observables_df = pd.read_excel(
-                        xls_file, sheet_name='Observables', header=1, index_col=0
-                    )
+                    observables_df = sheets['Observables']
                     self.description = observables_df.loc['Notes', 'Steps']
                     from baseclasses.helper.archive_builder.prevac_archive import (
                         get_observables,
@@ -294,6 +336,96 @@ class TFC_XRFLibrary(XRFLibrary, EntryData, PlotSection):
         ),
     )
 
+    create_xy_samples = Quantity(
+        type=bool,
+        default=False,
+        description="""
+        Creates a CatLab XY sample with thickness and composition for every
+        measurement position of the library. Positions that already have a sample
+        are skipped.
+        """,
+        a_eln=dict(component='BoolEditQuantity'),
+    )
+
+    def get_xy_sample(self, measurement, library_ref, library_id):
+        from nomad.datamodel.metainfo.basesections import ElementalComposition
+
+        from nomad_chemical_energy.schema_packages.hzb_catlab_package import (
+            CatLab_XYSample,
+        )
+
+        x, y = measurement.position_x, measurement.position_y
+        sample = CatLab_XYSample(
+            name=f'{library_id} {round(x, 5)},{round(y, 5)}',
+            lab_id=f'{library_id}_{get_position_hash(library_id, x, y)}',
+            library=library_ref,
+        )
+        position = sample.m_setdefault('position')
+        position.x = x
+        position.y = y
+
+        layer = measurement.layer[1] if len(measurement.layer) > 1 else None
+        if layer is None:
+            return sample
+        if layer.thickness is not None:
+            sample.m_setdefault('thickness').value = layer.thickness
+        # mass percentages of the same elements are exported as well, only the
+        # atomic percentages add up to the atomic fractions
+        amounts = {}
+        for composition in layer.composition or []:
+            if composition.amount is None or not is_atomic_percent(
+                composition.name or ''
+            ):
+                continue
+            element = get_element_symbol(composition.name or '')
+            if element is not None:
+                amounts[element] = amounts.get(element, 0) + composition.amount
+        total = sum(amounts.values())
+        if total > 0:
+            sample.elemental_composition = [
+                ElementalComposition(element=element, atomic_fraction=amount / total)
+                for element, amount in amounts.items()
+            ]
+        return sample
+
+    def create_xy_sample_entries(self, archive, logger):
+        """
+        Creates the XY samples of all measurement positions in one batch. The file
+        names contain a hash of the library and the position, so positions that
+        already have a sample are skipped without building their entry.
+        """
+        from nomad_chemical_energy.schema_packages.utilities.archive_batch import (
+            ArchiveBatch,
+        )
+
+        library_ref = self.samples[0].reference if self.samples else None
+        library_id = (
+            self.samples[0].lab_id
+            if self.samples and self.samples[0].lab_id
+            else self.data_folder.split('_')[0]
+        )
+        archive_batch = ArchiveBatch(archive)
+        number_of_samples = 0
+        for measurement in self.measurements:
+            if measurement.position_x is None or measurement.position_y is None:
+                continue
+            position_hash = get_position_hash(
+                library_id, measurement.position_x, measurement.position_y
+            )
+            file_name = os.path.join(
+                self.data_folder, f'{library_id}_xy_{position_hash}.archive.json'
+            )
+            if archive.m_context.raw_path_exists(file_name):
+                continue
+            sample = self.get_xy_sample(measurement, library_ref, library_id)
+            if archive_batch.add(sample, file_name):
+                number_of_samples += 1
+        archive_batch.flush()
+        logger.info(
+            f'created {number_of_samples} XY samples',
+            normalizer=self.__class__.__name__,
+        )
+
     def get_xrf_overview(self, logger):
         overview_df = pd.DataFrame()
         try:
@@ -482,6 +614,10 @@ class TFC_XRFLibrary(XRFLibrary, EntryData, PlotSection):
                 library_figures.append(json_fig)
             self.figures = library_figures
 
+        if self.create_xy_samples and self.measurements and self.data_folder:
+            self.create_xy_samples = False
+            self.create_xy_sample_entries(archive, logger)
+
         super().normalize(archive, logger)
 
 
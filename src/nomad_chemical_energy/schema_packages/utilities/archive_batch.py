@@ -0,0 +1,40 @@
+import json
+
+
+class ArchiveBatch:
+    """
+    Collects the entries a normalize creates in its own upload and writes them in one
+    go. All files are written before the first one is processed, so entries created
+    together can reference each other right away.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self._files = {}
+
+    def add(self, entry, file_name, overwrite=False):
+        """
+        Queues `entry` as `file_name`. Returns False if the file already exists and
+        `overwrite` is not set.
+        """
+        if not overwrite and (
+            file_name in self._files
+            or self.archive.m_context.raw_path_exists(file_name)
+        ):
+            return False
+        self._files[file_name] = (entry.m_to_dict(with_root_def=True), overwrite)
+        return True
+
+    def flush(self):
+        from nomad.datamodel.context import ClientContext
+
+        files, self._files = self._files, {}
+        if isinstance(self.archive.m_context, ClientContext):
+            return
+        for file_name, (entry_dict, _) in files.items():
+            with self.archive.m_context.raw_file(file_name, 'w') as outfile:
+                json.dump({'data': entry_dict}, outfile)
+        for file_name, (_, overwrite) in files.items():
+            self.archive.m_context.process_updated_raw_file(
+                file_name, allow_modify=overwrite
+            )
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def pad_series(series, fill_value=np.nan):
+    """
+    Stacks 1D arrays of different lengths into one 2D array, padded at the end with
+    `fill_value`. Returns the padded array and the length of every series.
+    """
+    lengths = np.array([len(values) for values in series], dtype=int)
+    padded = np.full((len(series), lengths.max(initial=0)), fill_value, dtype=float)
+    for idx, values in enumerate(series):
+        padded[idx, : lengths[idx]] = values
+    return padded, lengths
+
+
+def batch_trapezoid(ys, xs):
+    """
+    Returns the trapezoidal integral of every series `ys[i]` over `xs[i]`, computed
+    for all series in one pass over their concatenation.
+    """
+    lengths = np.array([len(y) for y in ys], dtype=int)
+    result = np.zeros(len(ys))
+    if len(ys) == 0 or lengths.sum() == 0:
+        return result
+    y = np.concatenate([np.asarray(y, dtype=float) for y in ys])
+    x = np.concatenate([np.asarray(x, dtype=float) for x in xs])
+    areas = np.diff(x) * (y[1:] + y[:-1]) / 2
+    # drop the trapezoids that bridge the end of one series and the next one
+    ends = np.cumsum(lengths)
+    areas = np.append(areas, 0.0)
+    areas[ends[lengths > 0] - 1] = 0.0
+    starts = ends - lengths
+    nonempty = lengths > 0
+    result[nonempty] = np.add.reduceat(areas, starts[nonempty])
+    return result
+
+
+def batch_interp(x, xps, fps):
+    """
+    Evaluates `np.interp(x, xps[i], fps[i])` for every series at once. The points
+    of every series are sorted by `xps[i]` first, so measured traces that are not
+    monotonic give the same value as `np.interp` on the sorted trace. Values
+    outside the range are clipped to the first or last value. Returns NaN for
+    empty series.
+    """
+    xp, lengths = pad_series(xps, fill_value=np.inf)
+    fp, _ = pad_series(fps)
+    # the padding is infinite and stays at the end of every row
+    order = np.argsort(xp, axis=1, kind='stable')
+    xp = np.take_along_axis(xp, order, axis=1)
+    fp = np.take_along_axis(fp, order, axis=1)
+    result = np.full(len(lengths), np.nan)
+    valid = lengths > 0
+    if not valid.any():
+        return result
+    xp, fp, lengths = xp[valid], fp[valid], lengths[valid]
+    rows = np.arange(len(lengths))
+    right = np.clip((xp <= x).sum(axis=1), 1, np.maximum(lengths - 1, 1))
+    left = right - 1
+    single = lengths == 1
+    right[single] = 0
+    left[single] = 0
+    x_left, x_right = xp[rows, left], xp[rows, right]
+    f_left, f_right = fp[rows, left], fp[rows, right]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.clip((x - x_left) / (x_right - x_left), 0, 1)
+    weight = np.where(np.isfinite(weight), weight, 0)
+    result[valid] = f_left + weight * (f_right - f_left)
+    return result
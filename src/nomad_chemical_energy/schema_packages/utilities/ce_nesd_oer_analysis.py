@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import re
 from datetime import datetime
 
 import numpy as np
@@ -33,6 +34,124 @@ from nomad.datamodel.results import Material, Results
 from nomad.metainfo import Quantity, Reference, Section, SubSection
 from nomad.units import ureg
 
+from nomad_chemical_energy.schema_packages.utilities.archive_batch import ArchiveBatch
+from nomad_chemical_energy.schema_packages.utilities.batched_arrays import (
+    batch_interp,
+    batch_trapezoid,
+)
+from nomad_chemical_energy.schema_packages.utilities.potentiostat_plots import (
+    make_nyquist_plot,
+)
+from nomad_chemical_energy.schema_packages.utilities.tafel import fit_tafel_slope
+
+# double layer CVs only span a narrow window in the non-faradaic region
+ECSA_MAX_WINDOW_WIDTH = 0.2  # V
+ECSA_CENTRE_TOLERANCE = 0.02  # V
+
+OER_INPUT_ENTRY_TYPES = [
+    'CE_NESD_CyclicVoltammetry',
+    'CE_NESD_LinearSweepVoltammetry',
+    'CE_NESD_PEIS',
+]
+NESD_SCHEMA_PACKAGE = 'nomad_chemical_energy.schema_packages.ce_nesd_package'
+
+
+def search_entries(data_archive, upload_id, folder_path, entry_types):
+    """
+    Returns the search results of all entries of the given types whose mainfile
+    starts with `folder_path`, fetched with a single (paged) search.
+    """
+    from elasticsearch_dsl import Q
+    from nomad.app.v1.models import MetadataPagination, MetadataRequired
+    from nomad.search import search
+
+    query = Q('term', upload_id=upload_id) & Q('terms', entry_type=entry_types)
+    if folder_path:
+        query &= Q('prefix', mainfile=folder_path)
+    pagination = MetadataPagination()
+    pagination.page_size = 10000
+    required = MetadataRequired()
+    # data quantities are only searchable qualified with their schema
+    required.include = ['entry_type', 'mainfile', 'entry_id', 'complete_time']
+    for entry_type in entry_types:
+        required.include.append(f'data.datetime#{NESD_SCHEMA_PACKAGE}.{entry_type}')
+        if entry_type in OER_INPUT_ENTRY_TYPES:
+            required.include.append(
+                f'data.data_file#{NESD_SCHEMA_PACKAGE}.{entry_type}'
+            )
+        if entry_type == 'CE_NESD_OERAnalysis':
+            required.include.append(
+                f'data.inputs_hash#{NESD_SCHEMA_PACKAGE}.{entry_type}'
+            )
+    lst = []
+    while True:
+        search_result = search(
+            owner='all',
+            query=query,
+            pagination=pagination,
+            required=required,
+            user_id=data_archive.metadata.main_author.user_id,
+        )
+        lst.extend(search_result.data)
+        next_page_after_value = search_result.pagination.next_page_after_value
+        if not next_page_after_value:
+            break
+        pagination.page_after_value = next_page_after_value
+    return lst
+
+
+def get_refs_by_entry_type(upload_id, nomad_entries, entry_types):
+    """
+    Partitions search results into `[data_file, reference]` pairs per entry
+    type, each ordered by the datetime of the entries.
+    """
+    lsts = {entry_type: [] for entry_type in entry_types}
+    for nomad_entry in nomad_entries:
+        if nomad_entry.get('entry_type') in lsts:
+            lsts[nomad_entry['entry_type']].append(nomad_entry)
+    refs = {}
+    for entry_type, lst in lsts.items():
+        lst.sort(
+            key=lambda nomad_entry: datetime.fromisoformat(
+                nomad_entry.get('data', {}).get('datetime', '')
+            )
+        )
+        refs[entry_type] = [
+            [
+                nomad_entry.get('data', {}).get('data_file'),
+                get_reference(upload_id, nomad_entry.get('entry_id', '')),
+            ]
+            for nomad_entry in lst
+        ]
+    return refs
+
+
+def get_inputs_hash(nomad_entries, parameters):
+    """
+    Returns a hash of the ids and processing times of the input entries and of the
+    analysis parameters. It changes whenever an input is added, removed or
+    reprocessed, or a parameter is changed.
+    """
+    from nomad.utils import hash
+
+    return hash(
+        *sorted(
+            f'{nomad_entry.get("entry_id")}:{nomad_entry.get("complete_time")}'
+            for nomad_entry in nomad_entries
+        ),
+        *parameters,
+    )
+
+
+def get_entries_from_folder(data_archive, upload_id, folder_path, entry_types):
+    """
+    Returns for every entry type the `[data_file, reference]` pairs of all
+    entries of this type in `folder_path`, ordered by their datetime. All entry
+    types are fetched with a single search.
+    """
+    nomad_entries = search_entries(data_archive, upload_id, folder_path, entry_types)
+    return get_refs_by_entry_type(upload_id, nomad_entries, entry_types)
+
 
 class NESD_OERReference(SectionReference):
     reference = Quantity(
@@ -62,6 +181,31 @@ class NESD_OERAnalysisResult(PlotSection, AnalysisResult):
         description='overpotential at 10 mA/cm²',
         unit=('V'),
     )
+    double_layer_capacitance = Quantity(
+        type=np.dtype(np.float64),
+        description='double layer capacitance from the scan rate series of CVs',
+        unit=('mF'),
+    )
+    ecsa = Quantity(
+        type=np.dtype(np.float64),
+        description='electrochemical active surface area',
+        unit=('cm^2'),
+    )
+    tafel_slope = Quantity(
+        type=np.dtype(np.float64),
+        description='Tafel slope per decade of current density, fitted in the most '
+        'linear region of the LSV within the fit window of the analysis.',
+        unit=('mV'),
+    )
+    tafel_intercept = Quantity(
+        type=np.dtype(np.float64),
+        description='Potential of the Tafel fit at a current density of 1 mA/cm².',
+        unit=('V'),
+    )
+    tafel_r_squared = Quantity(
+        type=np.dtype(np.float64),
+        description='Coefficient of determination of the Tafel fit.',
+    )
     reaction_type = Quantity(
         type=str,
         default='OER',
@@ -164,14 +308,22 @@ class NESD_OERAnalysisResult(PlotSection, AnalysisResult):
             self.initialize_figures()
         self.figures[1].figure = fig.to_plotly_json()
 
-    def set_eis_plot(self):
-        pass
+    def set_eis_plot(self, eis):
+        if eis is None or not eis.measurements:
+            return
+        fig = make_nyquist_plot(eis.measurements)
+        fig.update_layout(template='plotly_white')
+        if not self.figures:
+            self.initialize_figures()
+        self.figures[2].figure = fig.to_plotly_json()
 
-    def set_tafel_slopes(self, current_density, potential):
-        x_vals = np.log10(current_density.magnitude)
-        y_vals = potential.magnitude
+    def set_tafel_slopes(self, current_density, potential, potential_range=None):
+        current_density = current_density.to('mA/cm²').magnitude
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_vals = np.log10(current_density)
+        y_vals = potential.to(ureg.V).magnitude
 
-        y_unit = f'{potential.units:~P}'
+        y_unit = 'V'
 
         fig = go.Figure()
 
@@ -179,6 +331,21 @@ class NESD_OERAnalysisResult(PlotSection, AnalysisResult):
             go.Scatter(x=x_vals, y=y_vals, mode='markers', name='Data Points')
         )
 
+        tafel_fit = fit_tafel_slope(current_density, y_vals, potential_range)
+        if tafel_fit is not None:
+            self.tafel_slope = tafel_fit['slope'] * ureg.V
+            self.tafel_intercept = tafel_fit['intercept'] * ureg.V
+            self.tafel_r_squared = tafel_fit['r_squared']
+            fit_x = np.array([tafel_fit['start'], tafel_fit['stop']])
+            fig.add_trace(
+                go.Scatter(
+                    x=fit_x,
+                    y=tafel_fit['intercept'] + tafel_fit['slope'] * fit_x,
+                    mode='lines',
+                    name=f'Tafel fit ({tafel_fit["slope"] * 1000:.1f} mV/dec)',
+                )
+            )
+
         fig.update_layout(
             title_text='Tafel Slope (LSV)',
             xaxis_title='log(Current Density j)',
@@ -194,8 +361,39 @@ class NESD_OERAnalysisResult(PlotSection, AnalysisResult):
             self.initialize_figures()
         self.figures[3].figure = fig.to_plotly_json()
 
-    def set_ecsa_plot(self):
-        pass
+    def set_ecsa_plot(self, scan_rates, capacitive_currents, slope, intercept):
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=scan_rates,
+                y=capacitive_currents,
+                mode='markers',
+                name='Capacitive Current',
+            )
+        )
+        fit_x = np.array([0, np.max(scan_rates)])
+        fig.add_trace(
+            go.Scatter(
+                x=fit_x,
+                y=intercept + slope * fit_x,
+                mode='lines',
+                name=f'Linear Fit (C_dl = {slope:.4f} mF)',
+            )
+        )
+        fig.update_layout(
+            title_text='Double Layer Capacitance',
+            xaxis_title='Scan Rate [V/s]',
+            yaxis_title='Capacitive Current [mA]',
+            template='plotly_white',
+            hovermode='closest',
+            dragmode='zoom',
+            xaxis=dict(fixedrange=False),
+            yaxis=dict(fixedrange=False),
+        )
+
+        if not self.figures:
+            self.initialize_figures()
+        self.figures[4].figure = fig.to_plotly_json()
 
     def initialize_figures(self):
         self.figures = [
@@ -236,42 +434,81 @@ class NESD_OERAnalysis(Analysis):
     outputs = Analysis.outputs.m_copy()
     outputs.section_def = NESD_OERAnalysisResult
 
-    def get_entries_from_folder(self, data_archive, upload_id, folder_path, entry_type):
-        from nomad.app.v1.models import MetadataPagination
-        from nomad.search import search
+    update_input_resistance = Quantity(
+        type=bool,
+        default=True,
+        description="""
+        If true, the iR drop correction is written to the resistance of the CV and
+        LSV entries, which are then reprocessed. If false, the correction is only
+        applied to the voltages used for the results of this analysis.
+        """,
+        a_eln=dict(component='BoolEditQuantity'),
+    )
 
-        query = {
-            'upload_id': upload_id,
-            'entry_type': entry_type,
-        }
-        pagination = MetadataPagination()
-        pagination.page_size = 10000
-        search_result = search(
-            owner='all',
-            query=query,
-            pagination=pagination,
-            user_id=data_archive.metadata.main_author.user_id,
+    specific_capacitance = Quantity(
+        type=np.dtype(np.float64),
+        default=0.04,
+        description="""
+        Specific capacitance of the electrode material, used to convert the double
+        layer capacitance into the electrochemical active surface area.
+        """,
+        unit=('mF/cm^2'),
+        a_eln=dict(component='NumberEditQuantity', defaultDisplayUnit='mF/cm^2'),
+    )
+
+    tafel_fit_min_potential = Quantity(
+        type=np.dtype(np.float64),
+        description="""
+        Lower end of the potential window (vs RHE) in which the Tafel slope is
+        fitted. If no window is given, the whole LSV is used.
+        """,
+        unit=('V'),
+        a_eln=dict(component='NumberEditQuantity', defaultDisplayUnit='V'),
+    )
+
+    tafel_fit_max_potential = Quantity(
+        type=np.dtype(np.float64),
+        description="""
+        Upper end of the potential window (vs RHE) in which the Tafel slope is
+        fitted. If no window is given, the whole LSV is used.
+        """,
+        unit=('V'),
+        a_eln=dict(component='NumberEditQuantity', defaultDisplayUnit='V'),
+    )
+
+    inputs_hash = Quantity(
+        type=str,
+        description="""
+        Hash of the input entries and the parameters the outputs were computed
+        from. The outputs are only recomputed if it changes.
+        """,
+    )
+
+    def get_analysis_parameters(self):
+        return (
+            self.update_input_resistance,
+            self.specific_capacitance,
+            self.tafel_fit_min_potential,
+            self.tafel_fit_max_potential,
         )
 
-        lst = search_result.data
-        lst = [
-            nomad_entry
-            for nomad_entry in lst
-            if nomad_entry.get('mainfile', '').startswith(folder_path)
-        ]
-        lst.sort(
-            key=lambda nomad_entry: datetime.fromisoformat(
-                nomad_entry.get('data', {}).get('datetime', '')
+    def get_tafel_potential_range(self):
+        """
+        Returns the Tafel fit window in V, open ends replaced by infinity, or None
+        if no window is set.
+        """
+        if (
+            self.tafel_fit_min_potential is None
+            and self.tafel_fit_max_potential is None
+        ):
+            return None
+        return tuple(
+            default if potential is None else potential.to(ureg.V).magnitude
+            for potential, default in (
+                (self.tafel_fit_min_potential, -np.inf),
+                (self.tafel_fit_max_potential, np.inf),
             )
         )
-        refs = [
-            [
-                nomad_entry.get('data', {}).get('data_file'),
-                get_reference(upload_id, nomad_entry.get('entry_id', '')),
-            ]
-            for nomad_entry in lst
-        ]
-        return refs
 
     def get_ir_drop_correction(self, eis_refs):
         # TODO maybe revisit this and select not only first EIS ref but also check for 0V
@@ -285,12 +522,113 @@ class NESD_OERAnalysis(Analysis):
             return None
         return eis_value * ir_compensation
 
+    def get_potential_window(self, cv):
+        try:
+            voltage = cv.cycles[-1].voltage_rhe_compensated.to(ureg.V).magnitude
+        except (AttributeError, IndexError, TypeError):
+            return None
+        if len(voltage) == 0:
+            return None
+        return np.nanmin(voltage), np.nanmax(voltage)
+
+    def is_double_layer_cv(self, cv):
+        window = self.get_potential_window(cv)
+        return window is not None and window[1] - window[0] <= ECSA_MAX_WINDOW_WIDTH
+
     def get_cv(self, cv_refs):
-        # TODO maybe revisit and select not only first CV but also check for voltage range (>1.6V while ECSA is ~100mV in non-faradaic region)
+        # the narrow CVs in the non-faradaic region are used for the ECSA
         if not cv_refs:
             return None
-        cv_entry = cv_refs[0].reference
-        return cv_entry
+        cvs = [cv_ref.reference for cv_ref in cv_refs]
+        for cv in cvs:
+            if not self.is_double_layer_cv(cv):
+                return cv
+        return cvs[0]
+
+    def get_double_layer_series(self, cv_refs):
+        """
+        Returns the centre potential (V) and the CVs of the largest series of
+        double layer CVs, i.e. narrow CVs around the same potential recorded at
+        different scan rates.
+        """
+        series = []
+        for cv_ref in cv_refs:
+            cv = cv_ref.reference
+            properties = cv.get('properties')
+            if properties is None or properties.scan_rate is None:
+                continue
+            if not self.is_double_layer_cv(cv):
+                continue
+            centre = sum(self.get_potential_window(cv)) / 2
+            for group in series:
+                if abs(group[0] - centre) <= ECSA_CENTRE_TOLERANCE:
+                    group[1].append(cv)
+                    break
+            else:
+                series.append((centre, [cv]))
+        series = [
+            (np.mean([sum(self.get_potential_window(cv)) / 2 for cv in cvs]), cvs)
+            for _, cvs in series
+            if len({cv.properties.scan_rate.to('V/s').magnitude for cv in cvs}) > 1
+        ]
+        if not series:
+            return None, []
+        return max(series, key=lambda group: len(group[1]))
+
+    def get_ecsa(self, cv_refs):
+        """
+        Extracts the capacitive current at the centre of the double layer window
+        for all scan rates at once and fits it over the scan rate. The slope is the
+        double layer capacitance, which gives the ECSA with the specific
+        capacitance.
+        """
+        centre, cvs = self.get_double_layer_series(cv_refs)
+        if not cvs:
+            return None
+        voltages = {'anodic': [], 'cathodic': []}
+        currents = {'anodic': [], 'cathodic': []}
+        for cv in cvs:
+            cycle = cv.cycles[-1]
+            if cycle.current is None or len(cycle.current) < 2:
+                return None
+            voltage = cycle.voltage_rhe_compensated.to(ureg.V).magnitude
+            current = cycle.current.to('mA').magnitude
+            direction = np.gradient(voltage)
+            for branch, mask in (
+                ('anodic', direction > 0),
+                ('cathodic', direction < 0),
+            ):
+                order = np.argsort(voltage[mask], kind='stable')
+                voltages[branch].append(voltage[mask][order])
+                currents[branch].append(current[mask][order])
+        capacitive_currents = (
+            batch_interp(centre, voltages['anodic'], currents['anodic'])
+            - batch_interp(centre, voltages['cathodic'], currents['cathodic'])
+        ) / 2
+        scan_rates = np.array(
+            [cv.properties.scan_rate.to('V/s').magnitude for cv in cvs]
+        )
+        valid = np.isfinite(capacitive_currents)
+        if len(np.unique(scan_rates[valid])) < 2:
+            return None
+        slope, intercept = np.polyfit(scan_rates[valid], capacitive_currents[valid], 1)
+        double_layer_capacitance = slope * ureg.mF
+        ecsa = None
+        if self.specific_capacitance:
+            ecsa = (double_layer_capacitance / self.specific_capacitance).to('cm^2')
+        return {
+            'scan_rates': scan_rates[valid],
+            'capacitive_currents': capacitive_currents[valid],
+            'slope': slope,
+            'intercept': intercept,
+            'double_layer_capacitance': double_layer_capacitance,
+            'ecsa': ecsa,
+        }
+
+    def get_eis(self, eis_refs):
+        if not eis_refs:
+            return None
+        return eis_refs[0].reference
 
     def get_lsv(self, lsv_refs):
         # TODO maybe revisit because in example only the one in 1mV is used
@@ -299,13 +637,23 @@ class NESD_OERAnalysis(Analysis):
         lsv_entry = lsv_refs[0].reference
         return lsv_entry
 
-    def set_resistance_in_inputs(self, new_resistance, archive, logger):
-        for input in self.inputs:
+    def has_resistance(self, entry, resistance):
+        if entry.resistance is None:
+            return False
+        return np.isclose(
+            entry.resistance.to(ureg.ohm).magnitude,
+            resistance.to(ureg.ohm).magnitude,
+        )
+
+    def set_resistance_in_inputs(self, new_resistance, archive, logger, inputs=None):
+        for input in self.inputs if inputs is None else inputs:
             entry = input.reference
             if entry.method == 'Multiple Electrochemical Impedance Spectroscopy':
                 continue
             if entry.method is None:
                 continue
+            if self.has_resistance(entry, new_resistance):
+                continue
             new_entry = entry.m_copy()
             new_entry.resistance = new_resistance
             if new_entry is not None:
@@ -318,65 +666,120 @@ class NESD_OERAnalysis(Analysis):
                     overwrite=True,
                 )
 
-    def get_charge_density(self, cv_cycle, scan_rate):
-        scan_rate = scan_rate.to('V/s').magnitude
-        voltage = cv_cycle.voltage_rhe_compensated.to(ureg.V).magnitude
-        current_density = cv_cycle.current_density.to('mA/cm²').magnitude
+    def get_ir_corrected_voltage(
+        self, voltage_rhe_compensated, current, applied_resistance, resistance
+    ):
+        """
+        Returns `voltage_rhe_compensated` corrected for `resistance` instead of the
+        `applied_resistance` the measurement was normalized with. This keeps the
+        results in sync with the iR drop correction without reprocessing the
+        measurement entries.
+        """
+        if resistance is None or current is None or voltage_rhe_compensated is None:
+            return voltage_rhe_compensated
+        if applied_resistance is None:
+            applied_resistance = 0 * ureg.ohm
+        resistance_difference = resistance - applied_resistance
+        return (voltage_rhe_compensated - current * resistance_difference).to(
+            voltage_rhe_compensated.units
+        )
 
+    def get_forward_scan(self, cv_voltage, cv_cycle):
+        voltage = cv_voltage.to(ureg.V).magnitude
+        current_density = cv_cycle.current_density.to('mA/cm²').magnitude
         turning_point_idx = voltage.argmax()
-        # Forward Scan
-        voltage_fwd = voltage[: turning_point_idx + 1]
-        current_density_fwd = current_density[: turning_point_idx + 1]
+        return (
+            voltage[: turning_point_idx + 1],
+            np.abs(current_density[: turning_point_idx + 1]),
+        )
 
+    def get_charge_density(self, cv_voltage, cv_cycle, scan_rate):
+        voltage_fwd, current_density_fwd = self.get_forward_scan(cv_voltage, cv_cycle)
         charge_density = (
-            np.trapz(np.abs(current_density_fwd), voltage_fwd) / scan_rate
+            batch_trapezoid([current_density_fwd], [voltage_fwd])[0]
+            / scan_rate.to('V/s').magnitude
         )  # [mC/cm²]
         return charge_density
 
-    def get_overpotential(self, lsv):
+    def get_overpotential(self, lsv_voltage):
         theoretical_oer_potential = 1.23 * ureg.V
-        overpotential = (
-            lsv.voltage_rhe_compensated.to(ureg.V) - theoretical_oer_potential
-        )
+        overpotential = lsv_voltage.to(ureg.V) - theoretical_oer_potential
         return overpotential
 
-    def get_oer_analysis_result(self, cv_refs, lsv_refs):
+    def get_cv_voltage(self, cv, resistance):
+        last_cv_cycle = cv.cycles[-1]
+        return self.get_ir_corrected_voltage(
+            last_cv_cycle.voltage_rhe_compensated,
+            last_cv_cycle.current,
+            cv.resistance,
+            resistance,
+        )
+
+    def get_lsv_voltage(self, lsv, resistance):
+        return self.get_ir_corrected_voltage(
+            lsv.voltage_rhe_compensated, lsv.current, lsv.resistance, resistance
+        )
+
+    def get_oer_analysis_result(self, cv_refs, lsv_refs, eis_refs, resistance=None):
         if not cv_refs and not lsv_refs:
             return
-        overpotential, charge_density, overpotential_at_10 = None, None, None
-        samples = None
+        metrics = {'ecsa': self.get_ecsa(cv_refs)}
         cv = self.get_cv(cv_refs)
         if cv:
-            last_cv_cycle = cv.cycles[-1]
-            scan_rate = cv.get('properties').scan_rate
-            charge_density = self.get_charge_density(last_cv_cycle, scan_rate)
-            if not samples:
-                samples = cv.samples
-
+            metrics['charge_density'] = self.get_charge_density(
+                self.get_cv_voltage(cv, resistance),
+                cv.cycles[-1],
+                cv.get('properties').scan_rate,
+            )
         lsv = self.get_lsv(lsv_refs)
         if lsv:
-            overpotential = self.get_overpotential(lsv)
-            overpotential_at_10 = np.interp(
+            # same interpolation as the batch analysis
+            metrics['overpotential_at_10mA_cm2'] = batch_interp(
                 10,
-                lsv.current_density.to('mA/cm²').magnitude,
-                overpotential.to(ureg.V).magnitude,
-            )
+                [lsv.current_density.to('mA/cm²').magnitude],
+                [
+                    self.get_overpotential(self.get_lsv_voltage(lsv, resistance))
+                    .to(ureg.V)
+                    .magnitude
+                ],
+            )[0]
+        result_entry = self.make_oer_analysis_result(cv, lsv, resistance, metrics)
+        result_entry.set_eis_plot(self.get_eis(eis_refs))
+        return result_entry
+
+    def make_oer_analysis_result(self, cv, lsv, resistance, metrics):
+        """
+        Creates the result section with its figures from the metrics computed for
+        the CV and LSV of one electrode folder.
+        """
+        overpotential = None
+        charge_density = metrics.get('charge_density')
+        ecsa = metrics.get('ecsa') or {}
+        samples = None
+        if cv:
+            cv_voltage = self.get_cv_voltage(cv, resistance)
+            samples = cv.samples
+        if lsv:
+            lsv_voltage = self.get_lsv_voltage(lsv, resistance)
+            overpotential = self.get_overpotential(lsv_voltage)
             if not samples:
                 samples = lsv.samples
 
         result_entry = NESD_OERAnalysisResult(
-            name=f'{("/" + cv.name).rsplit("/", 1)[0]}/OER_analysis'[1:],
+            name=f'{("/" + (cv or lsv).name).rsplit("/", 1)[0]}/OER_analysis'[1:],
             reaction_type='OER',
             charge_density=charge_density,
             overpotential=overpotential,
-            overpotential_at_10mA_cm2=overpotential_at_10,
+            overpotential_at_10mA_cm2=metrics.get('overpotential_at_10mA_cm2'),
+            double_layer_capacitance=ecsa.get('double_layer_capacitance'),
+            ecsa=ecsa.get('ecsa'),
             samples=samples,
         )
         result_entry.samples[0].name = result_entry.samples[0].reference.name
         if charge_density:
             result_entry.set_charge_density_plot(
-                last_cv_cycle.voltage_rhe_compensated,
-                last_cv_cycle.current_density,
+                cv_voltage,
+                cv.cycles[-1].current_density,
                 charge_density,
             )
         if overpotential is not None:
@@ -386,28 +789,43 @@ class NESD_OERAnalysis(Analysis):
             )
         if lsv:
             result_entry.set_tafel_slopes(
-                lsv.current_density, lsv.voltage_rhe_compensated
+                lsv.current_density, lsv_voltage, self.get_tafel_potential_range()
+            )
+        if ecsa:
+            result_entry.set_ecsa_plot(
+                ecsa['scan_rates'],
+                ecsa['capacitive_currents'],
+                ecsa['slope'],
+                ecsa['intercept'],
             )
 
         return result_entry
 
-    def get_nesd_oer_ref_list(self, archive, folder, entry_type):
-        ref_list = self.get_entries_from_folder(
-            archive, archive.metadata.upload_id, folder, entry_type
-        )
-        refs = [NESD_OERReference(name=name, reference=ref) for [name, ref] in ref_list]
-        return refs
+    def get_nesd_oer_ref_lists(self, upload_id, nomad_entries, entry_types):
+        ref_lists = get_refs_by_entry_type(upload_id, nomad_entries, entry_types)
+        return [
+            [NESD_OERReference(name=name, reference=ref) for [name, ref] in ref_list]
+            for ref_list in ref_lists.values()
+        ]
 
     def normalize(self, archive, logger):
+        upload_id = archive.metadata.upload_id
         folder = ('/' + archive.metadata.mainfile).rsplit('/', 1)[0][1:]
-        cv_refs = self.get_nesd_oer_ref_list(
-            archive, folder, 'CE_NESD_CyclicVoltammetry'
-        )
-        lsv_refs = self.get_nesd_oer_ref_list(
-            archive, folder, 'CE_NESD_LinearSweepVoltammetry'
+        nomad_entries = search_entries(
+            archive, upload_id, folder, OER_INPUT_ENTRY_TYPES
         )
-        eis_refs = self.get_nesd_oer_ref_list(archive, folder, 'CE_NESD_PEIS')
-        self.inputs = cv_refs + lsv_refs + eis_refs
+        inputs_hash = get_inputs_hash(nomad_entries, self.get_analysis_parameters())
+        # entries created by a batch analysis come with the outputs for their
+        # inputs, they are only recomputed once the inputs change
+        if not self.outputs or self.inputs_hash != inputs_hash:
+            cv_refs, lsv_refs, eis_refs = self.get_nesd_oer_ref_lists(
+                upload_id, nomad_entries, OER_INPUT_ENTRY_TYPES
+            )
+            self.inputs = cv_refs + lsv_refs + eis_refs
+            self.outputs = []
+            if self.inputs:
+                self.set_outputs(archive, logger, cv_refs, lsv_refs, eis_refs)
+            self.inputs_hash = inputs_hash
 
         if self.inputs is not None and len(self.inputs) > 0:
             for sample in self.inputs[0].reference.samples:
@@ -425,17 +843,214 @@ class NESD_OERAnalysis(Analysis):
                         )
                         Formula(formulas).populate(section=archive.results.material)
                     except Exception as e:
-                        logger.warn('Could not analyse material', exc_info=e)
+                        logger.warning('Could not analyse material', exc_info=e)
+        super().normalize(archive, logger)
+
+    def set_outputs(self, archive, logger, cv_refs, lsv_refs, eis_refs):
+        ir_drop_correction = self.get_ir_drop_correction(eis_refs)
+        if ir_drop_correction is None:
+            return
+        if self.update_input_resistance:
+            self.set_resistance_in_inputs(ir_drop_correction, archive, logger)
+        # the referenced entries still hold their previous resistance, so
+        # the correction is applied to the voltages of the results directly
+        output = self.get_oer_analysis_result(
+            cv_refs, lsv_refs, eis_refs, ir_drop_correction
+        )
+        if output:
+            self.outputs = [output]
+            for oer_output in self.outputs:
+                oer_output.normalize(archive, logger)
+
+
+class NESD_OERBatchAnalysis(NESD_OERAnalysis):
+    """
+    Computes the OER metrics of all electrode folders of an upload in one pass.
+    All CV, LSV and PEIS entries are found with a single search, the CVs and LSV
+    of every folder are loaded once and the charge densities and overpotentials at
+    10 mA/cm² are computed for all folders together.
+    """
+
+    m_def = Section(label_quantity='name')
 
+    create_analysis_entries = Quantity(
+        type=bool,
+        default=False,
+        description="""
+        If true, an OER analysis entry is created for every electrode folder that
+        does not have one yet. Existing analysis entries whose inputs changed are
+        overwritten with the new results.
+        """,
+        a_eln=dict(component='BoolEditQuantity'),
+    )
+
+    def get_folder_refs(self, archive):
+        """
+        Returns the CV, LSV and PEIS references and the inputs hash per electrode
+        folder, and the search results of the OER analysis entries per folder.
+        """
+        upload_id = archive.metadata.upload_id
+        nomad_entries = search_entries(
+            archive, upload_id, '', OER_INPUT_ENTRY_TYPES + ['CE_NESD_OERAnalysis']
+        )
+        entries_by_folder = {}
+        analysis_entries = {}
+        for nomad_entry in sorted(
+            nomad_entries, key=lambda nomad_entry: nomad_entry.get('mainfile', '')
+        ):
+            folder = ('/' + nomad_entry.get('mainfile', '')).rsplit('/', 1)[0][1:]
+            if nomad_entry.get('entry_type') == 'CE_NESD_OERAnalysis':
+                analysis_entries.setdefault(folder, nomad_entry)
+                continue
+            entries_by_folder.setdefault(folder, []).append(nomad_entry)
+
+        folder_refs, inputs_hashes = {}, {}
+        for folder, folder_entries in sorted(entries_by_folder.items()):
+            folder_refs[folder] = self.get_nesd_oer_ref_lists(
+                upload_id, folder_entries, OER_INPUT_ENTRY_TYPES
+            )
+            # same inputs as the mainfile prefix search of an analysis entry
+            inputs_hashes[folder] = get_inputs_hash(
+                [
+                    nomad_entry
+                    for nomad_entry in nomad_entries
+                    if nomad_entry.get('entry_type') in OER_INPUT_ENTRY_TYPES
+                    and nomad_entry.get('mainfile', '').startswith(folder)
+                ],
+                self.get_analysis_parameters(),
+            )
+        return folder_refs, inputs_hashes, analysis_entries
+
+    def get_batch_metrics(self, measurements):
+        """
+        Computes the metrics of all folders at once. `measurements` maps every
+        folder to its `(cv, lsv, resistance)`.
+        """
+        metrics = {folder: {} for folder in measurements}
+
+        cv_folders, voltages, current_densities, scan_rates = [], [], [], []
+        for folder, (cv, _, resistance) in measurements.items():
+            if not cv:
+                continue
+            voltage_fwd, current_density_fwd = self.get_forward_scan(
+                self.get_cv_voltage(cv, resistance), cv.cycles[-1]
+            )
+            cv_folders.append(folder)
+            voltages.append(voltage_fwd)
+            current_densities.append(current_density_fwd)
+            scan_rates.append(cv.get('properties').scan_rate.to('V/s').magnitude)
+        charge_densities = batch_trapezoid(current_densities, voltages) / np.array(
+            scan_rates, dtype=float
+        )  # [mC/cm²]
+        for folder, charge_density in zip(cv_folders, charge_densities):
+            metrics[folder]['charge_density'] = charge_density
+
+        lsv_folders, current_densities, overpotentials = [], [], []
+        for folder, (_, lsv, resistance) in measurements.items():
+            if not lsv:
+                continue
+            lsv_folders.append(folder)
+            current_densities.append(lsv.current_density.to('mA/cm²').magnitude)
+            overpotentials.append(
+                self.get_overpotential(self.get_lsv_voltage(lsv, resistance))
+                .to(ureg.V)
+                .magnitude
+            )
+        overpotentials_at_10 = batch_interp(10, current_densities, overpotentials)
+        for folder, overpotential_at_10 in zip(lsv_folders, overpotentials_at_10):
+            metrics[folder]['overpotential_at_10mA_cm2'] = overpotential_at_10
+        return metrics
+
+    def create_analysis_entry(self, archive_batch, mainfile, refs, output, inputs_hash):
+        """
+        Queues an OER analysis entry as `mainfile` with the parameters of this batch
+        and the references and the result it computed, so the entry does not compute
+        them again. An existing entry is overwritten.
+        """
+        from nomad_chemical_energy.schema_packages.ce_nesd_package import (
+            CE_NESD_OERAnalysis,
+        )
+
+        archive_batch.add(
+            CE_NESD_OERAnalysis(
+                name=mainfile.split('.archive.')[0],
+                update_input_resistance=self.update_input_resistance,
+                specific_capacitance=self.specific_capacitance,
+                tafel_fit_min_potential=self.tafel_fit_min_potential,
+                tafel_fit_max_potential=self.tafel_fit_max_potential,
+                inputs=[ref.m_copy(deep=True) for ref in refs],
+                outputs=[output.m_copy(deep=True)],
+                inputs_hash=inputs_hash,
+            ),
+            mainfile,
+            overwrite=True,
+        )
+
+    def normalize(self, archive, logger):
+        folder_refs, inputs_hashes, analysis_entries = self.get_folder_refs(archive)
+        self.inputs = [
+            ref
+            for ref_lists in folder_refs.values()
+            for refs in ref_lists
+            for ref in refs
+        ]
+
+        measurements = {}
+        for folder, (cv_refs, lsv_refs, eis_refs) in folder_refs.items():
+            if not cv_refs and not lsv_refs:
+                continue
             ir_drop_correction = self.get_ir_drop_correction(eis_refs)
-            if ir_drop_correction is not None:
-                self.set_resistance_in_inputs(ir_drop_correction, archive, logger)
-                output = self.get_oer_analysis_result(cv_refs, lsv_refs)
-                if output:
-                    self.outputs = [output]
-                    for oer_output in self.outputs:
-                        oer_output.normalize(archive, logger)
-        super().normalize(archive, logger)
+            if ir_drop_correction is None:
+                continue
+            if self.update_input_resistance:
+                self.set_resistance_in_inputs(
+                    ir_drop_correction, archive, logger, cv_refs + lsv_refs
+                )
+            measurements[folder] = (
+                self.get_cv(cv_refs),
+                self.get_lsv(lsv_refs),
+                ir_drop_correction,
+            )
+
+        metrics = self.get_batch_metrics(measurements)
+        self.outputs = []
+        folder_outputs = {}
+        for folder, (cv, lsv, resistance) in measurements.items():
+            cv_refs, _, eis_refs = folder_refs[folder]
+            try:
+                metrics[folder]['ecsa'] = self.get_ecsa(cv_refs)
+                output = self.make_oer_analysis_result(
+                    cv, lsv, resistance, metrics[folder]
+                )
+                output.set_eis_plot(self.get_eis(eis_refs))
+            except Exception as e:
+                logger.warning(f'Could not analyse folder {folder}', exc_info=e)
+                continue
+            output.normalize(archive, logger)
+            self.outputs.append(output)
+            folder_outputs[folder] = output
+
+        if self.create_analysis_entries:
+            archive_batch = ArchiveBatch(archive)
+            for folder, output in folder_outputs.items():
+                analysis_entry = analysis_entries.get(folder, {})
+                if (
+                    analysis_entry.get('data', {}).get('inputs_hash')
+                    == inputs_hashes[folder]
+                ):
+                    continue
+                refs = [ref for refs in folder_refs[folder] for ref in refs]
+                self.create_analysis_entry(
+                    archive_batch,
+                    analysis_entry.get(
+                        'mainfile', f'{folder}/oer_analysis.archive.json'
+                    ),
+                    refs,
+                    output,
+                    inputs_hashes[folder],
+                )
+            archive_batch.flush()
+        Analysis.normalize(self, archive, logger)
 
 
 class NESD_OERAnalysisReference(SectionReference):
@@ -503,7 +1118,7 @@ class NESD_OERComparisonResult(AnalysisResult):
         }
         if quantity_name not in supported_quantities:
             return
-        if quantity is None:
+        if quantity is None or len(quantity) == 0:
             return
         setattr(self, f'mean_{quantity_name}', np.mean(quantity))
         setattr(self, f'std_dev_{quantity_name}', np.std(quantity))
@@ -522,3 +1137,118 @@ class NESD_OERCompareReplicates(Analysis):
 
     outputs = Analysis.outputs.m_copy()
     outputs.section_def = NESD_OERComparisonResult
+
+    def get_analysis_entry_ids(self):
+        """
+        Returns the entry ids of the referenced analyses. The ids are read from the
+        unresolved references, so the analysis archives are not loaded.
+        """
+        entry_ids = []
+        for analysis_ref in self.inputs or []:
+            reference = analysis_ref.reference
+            if reference is None:
+                continue
+            match = re.search(
+                r'archive/([^/#]+)', str(getattr(reference, 'm_proxy_value', ''))
+            )
+            if match:
+                entry_ids.append(match.group(1))
+            else:
+                entry_ids.append(reference.m_root().metadata.entry_id)
+        return entry_ids
+
+    def search_analysis_outputs(self, archive, entry_ids):
+        """
+        Yields the search results of the referenced analyses with only their
+        scalar outputs, page by page.
+        """
+        from nomad.app.v1.models import MetadataPagination, MetadataRequired
+        from nomad.search import search
+
+        pagination = MetadataPagination()
+        pagination.page_size = 1000
+        required = MetadataRequired()
+        required.include = [
+            'entry_id',
+            'upload_id',
+            'mainfile',
+            f'data.outputs.charge_density#{NESD_SCHEMA_PACKAGE}.CE_NESD_OERAnalysis',
+            f'data.outputs.overpotential_at_10mA_cm2#{NESD_SCHEMA_PACKAGE}'
+            '.CE_NESD_OERAnalysis',
+        ]
+        while True:
+            search_result = search(
+                owner='all',
+                query={'entry_id:any': entry_ids},
+                pagination=pagination,
+                required=required,
+                user_id=archive.metadata.main_author.user_id,
+            )
+            yield from search_result.data
+            next_page_after_value = search_result.pagination.next_page_after_value
+            if not next_page_after_value:
+                break
+            pagination.page_after_value = next_page_after_value
+
+    def get_selected_electrode(self, archive, nomad_entry, entry_type):
+        """
+        Returns a reference to the first measurement of the given type in the folder
+        of the analysis in `nomad_entry`, found by search.
+        """
+        if nomad_entry is None:
+            return None
+        folder = ('/' + nomad_entry.get('mainfile', '')).rsplit('/', 1)[0][1:]
+        refs = get_entries_from_folder(
+            archive, nomad_entry.get('upload_id'), folder, [entry_type]
+        )[entry_type]
+        if not refs:
+            return None
+        name, reference = refs[0]
+        return NESD_OERReference(name=name, reference=reference)
+
+    def normalize(self, archive, logger):
+        entry_ids = self.get_analysis_entry_ids()
+        # the outputs are read from the search index, which is cheap enough to
+        # recompute them on every normalize and follow changes of the analyses
+        self.outputs = []
+        if entry_ids:
+            # values in the search index are in SI units
+            quantities = {
+                'charge_density': ('charge_density', ureg('C/m^2'), 'mC/cm^2'),
+                'overpotential': ('overpotential_at_10mA_cm2', ureg.V, 'mV'),
+            }
+            values = {name: [] for name in quantities}
+            for nomad_entry in self.search_analysis_outputs(archive, entry_ids):
+                outputs = nomad_entry.get('data', {}).get('outputs') or [{}]
+                for name, (output_name, si_unit, unit) in quantities.items():
+                    value = outputs[0].get(output_name)
+                    if value is not None:
+                        value = (value * si_unit).to(unit).magnitude
+                        values[name].append((value, nomad_entry))
+
+            if any(values.values()):
+                result = NESD_OERComparisonResult(
+                    charge_densities=[value for value, _ in values['charge_density']],
+                    overpotentials=[value for value, _ in values['overpotential']],
+                )
+                result.calculate_statistics(result.charge_densities, 'charge_density')
+                result.calculate_statistics(result.overpotentials, 'overpotential')
+                # the replicate closest to the mean represents the series
+                selected = {
+                    name: min(
+                        values[name],
+                        key=lambda item, name=name, unit=unit: abs(
+                            item[0] - getattr(result, f'mean_{name}').to(unit).magnitude
+                        ),
+                        default=(None, None),
+                    )[1]
+                    for name, (_, _, unit) in quantities.items()
+                }
+                result.selected_electrode_charge_density = self.get_selected_electrode(
+                    archive, selected['charge_density'], 'CE_NESD_CyclicVoltammetry'
+                )
+                result.selected_electrode_overpotential = self.get_selected_electrode(
+                    archive, selected['overpotential'], 'CE_NESD_LinearSweepVoltammetry'
+                )
+                self.outputs = [result]
+        super().normalize(archive, logger)
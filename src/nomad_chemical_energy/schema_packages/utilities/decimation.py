@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def minmax_decimation_indices(values, max_points, keep_indices=None):
+    """
+    Returns the sorted indices of the points that represent `values` in at most
+    about `max_points` points. The series is split into buckets and the minimum and
+    maximum of every bucket are kept, so all extrema survive. The first and last
+    point and all `keep_indices` are always included.
+    """
+    values = np.asarray(values, dtype=float)
+    num_values = len(values)
+    if num_values <= max_points:
+        return np.arange(num_values)
+
+    num_buckets = max(1, (max_points - 2) // 2)
+    bucket_size = int(np.ceil(num_values / num_buckets))
+    padded = np.full(num_buckets * bucket_size, np.nan)
+    padded[:num_values] = values
+    buckets = padded.reshape(num_buckets, bucket_size)
+    is_nan = np.isnan(buckets)
+    offsets = np.arange(num_buckets) * bucket_size
+    minima = np.where(is_nan, np.inf, buckets).argmin(axis=1) + offsets
+    maxima = np.where(is_nan, -np.inf, buckets).argmax(axis=1) + offsets
+
+    indices = [np.array([0, num_values - 1]), minima, maxima]
+    if keep_indices is not None:
+        indices.append(np.asarray(keep_indices, dtype=int))
+    indices = np.concatenate(indices)
+    return np.unique(indices[(indices >= 0) & (indices < num_values)])
+
+
+def nearest_indices(sorted_x, x_values):
+    """
+    Returns for every value in `x_values` the index of the closest value in the
+    ascending array `sorted_x`.
+    """
+    sorted_x = np.asarray(sorted_x)
+    x_values = np.asarray(x_values)
+    if len(sorted_x) == 0 or len(x_values) == 0:
+        return np.array([], dtype=int)
+    if len(sorted_x) == 1:
+        return np.zeros(len(x_values), dtype=int)
+    right = np.clip(np.searchsorted(sorted_x, x_values), 1, len(sorted_x) - 1)
+    left = right - 1
+    take_left = np.abs(x_values - sorted_x[left]) <= np.abs(sorted_x[right] - x_values)
+    return np.where(take_left, left, right)
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+
+PREVIEW_MAX_SIZE = 1024
+PYRAMID_MAX_SIZE = 2048
+PYRAMID_TILE_SIZE = 256
+
+
+def read_tif_plane(file):
+    """
+    Returns the first image plane of a TIFF file without loading it into memory.
+    Uncompressed images are memory-mapped in place, compressed ones are decoded
+    strip- or tile-wise into a temporary memory-mapped array.
+    """
+    import tifffile
+
+    with tifffile.TiffFile(file) as tif:
+        page = tif.pages[0]
+        if page.is_memmappable:
+            data = tifffile.memmap(file, page=0, mode='r')
+        else:
+            data = page.asarray(out='memmap')
+    while data.ndim > 3 or (data.ndim == 3 and data.shape[-1] not in (3, 4)):
+        data = data[0]
+    return data
+
+
+def downscale(data, max_size):
+    """
+    Returns a copy of `data` subsampled with a constant step, so that no side is
+    longer than `max_size`. Only the selected rows of a memory-mapped array are read.
+    """
+    step = max(1, math.ceil(max(data.shape[:2]) / max_size))
+    return np.array(data[::step, ::step])
+
+
+def to_uint8(data):
+    """
+    Scales an image to 8 bit between its 0.5 and 99.5 percentiles.
+    """
+    if data.dtype == np.uint8:
+        return data
+    data = data.astype(float)
+    low, high = np.nanpercentile(data, [0.5, 99.5])
+    if high <= low:
+        high = low + 1
+    return (np.clip((data - low) / (high - low), 0, 1) * 255).astype(np.uint8)
+
+
+def halve(data):
+    """
+    Halves the resolution of an image by averaging blocks of 2x2 pixels.
+    """
+    height, width = data.shape[:2]
+    if height > 1 and width > 1:
+        data = data[: height - height % 2, : width - width % 2]
+        blocks = data.reshape(height // 2, 2, width // 2, 2, *data.shape[2:])
+        return blocks.mean(axis=(1, 3), dtype=float).astype(data.dtype)
+    return data[::2, ::2]
+
+
+def get_pyramid_levels(base, tile_size=PYRAMID_TILE_SIZE):
+    """
+    Returns the levels of a tile pyramid from `base`, coarsest first. Each level has
+    half the resolution of the next one, and the coarsest fits into a single tile.
+    """
+    levels = [base]
+    while max(levels[0].shape[:2]) > tile_size:
+        levels.insert(0, halve(levels[0]))
+    return levels
+
+
+def iter_tiles(level, tile_size=PYRAMID_TILE_SIZE):
+    """
+    Yields the row, column and data of every tile of a pyramid level.
+    """
+    height, width = level.shape[:2]
+    for row in range(math.ceil(height / tile_size)):
+        for col in range(math.ceil(width / tile_size)):
+            yield (
+                row,
+                col,
+                level[
+                    row * tile_size : (row + 1) * tile_size,
+                    col * tile_size : (col + 1) * tile_size,
+                ],
+            )
+
+
+def save_png(data, file):
+    from PIL import Image
+
+    Image.fromarray(data).save(file, format='PNG')
@@ -0,0 +1,96 @@
+import re
+
+
+def search_lab_id_numbers(archive, prefix, query=None, digits=None):
+    """
+    Returns a dict of entry id to the numbers of all lab ids of the form
+    `{prefix}{number}`, found with one prefix query. `query` optionally restricts
+    the search further, e.g. to an entry type. If `digits` is given, only numbers
+    with exactly that many digits are considered.
+    """
+    from elasticsearch_dsl import Q
+    from nomad.app.v1.models import MetadataPagination, MetadataRequired
+    from nomad.search import search
+
+    pattern = re.compile(
+        re.escape(prefix) + (rf'(\d{{{digits}}})' if digits else r'(\d+)')
+    )
+    search_query = Q('prefix', **{'results.eln.lab_ids': prefix})
+    for key, value in (query or {}).items():
+        search_query &= Q('term', **{key: value})
+    required = MetadataRequired()
+    required.include = ['entry_id', 'results.eln.lab_ids']
+    pagination = MetadataPagination()
+    pagination.page_size = 1000
+
+    numbers = {}
+    while True:
+        search_result = search(
+            owner='all',
+            query=search_query,
+            pagination=pagination,
+            required=required,
+            user_id=archive.metadata.main_author.user_id,
+        )
+        for entry in search_result.data:
+            lab_ids = entry.get('results', {}).get('eln', {}).get('lab_ids', [])
+            matches = [pattern.fullmatch(lab_id) for lab_id in lab_ids]
+            numbers[entry['entry_id']] = [int(m.group(1)) for m in matches if m]
+        next_page = search_result.pagination.next_page_after_value
+        if not next_page or not search_result.data:
+            return numbers
+        pagination.page_after_value = next_page
+
+
+LAB_ID_COUNTER_COLLECTION = 'lab_id_counters'
+
+
+def get_next_lab_id_number(numbers):
+    """
+    Returns the number after the highest one in `numbers`, as returned by
+    `search_lab_id_numbers`.
+    """
+    return max((n for ns in numbers.values() for n in ns), default=0) + 1
+
+
+def get_lab_id_counter_key(prefix, query=None, digits=None):
+    return '|'.join(
+        [prefix, str(digits or '')]
+        + [f'{key}={value}' for key, value in sorted((query or {}).items())]
+    )
+
+
+def reserve_lab_id_numbers(archive, prefix, count=1, query=None, digits=None):
+    """
+    Reserves `count` consecutive numbers for lab ids of the form `{prefix}{number}`
+    and returns the first one. The numbers are handed out by an atomic counter
+    document per prefix in MongoDB, so workers numbering in parallel get disjoint
+    ranges. The counter is first raised to the highest number in the search index,
+    which covers lab ids that were entered by hand.
+    """
+    from nomad import config, infrastructure
+    from pymongo import ReturnDocument
+    from pymongo.errors import DuplicateKeyError
+
+    numbers = search_lab_id_numbers(archive, prefix, query, digits)
+    if infrastructure.mongo_client is None:
+        # without a database, e.g. when parsing locally, nothing is shared
+        return get_next_lab_id_number(numbers)
+    counters = infrastructure.mongo_client[config.mongo.db_name][
+        LAB_ID_COUNTER_COLLECTION
+    ]
+    counter_key = get_lab_id_counter_key(prefix, query, digits)
+    highest = get_next_lab_id_number(numbers) - 1
+    try:
+        counters.update_one(
+            {'_id': counter_key}, {'$max': {'value': highest}}, upsert=True
+        )
+    except DuplicateKeyError:
+        # another worker created the counter at the same time
+        counters.update_one({'_id': counter_key}, {'$max': {'value': highest}})
+    counter = counters.find_one_and_update(
+        {'_id': counter_key},
+        {'$inc': {'value': count}},
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter['value'] - count + 1
@@ -0,0 +1,85 @@
+import numpy as np
+
+TAFEL_NUM_WINDOW_SIZES = 20
+TAFEL_R_SQUARED_TOLERANCE = 1e-3
+
+
+def get_backscan(voltage, current_density):
+    """
+    Returns the part of a cyclic voltammetry cycle after its anodic turning point.
+    """
+    voltage = np.asarray(voltage, dtype=float)
+    current_density = np.asarray(current_density, dtype=float)
+    turning_point_idx = voltage.argmax()
+    return voltage[turning_point_idx:], current_density[turning_point_idx:]
+
+
+def _window_sums(values, starts, ends):
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    return cumulative[ends] - cumulative[starts]
+
+
+def fit_tafel_slope(current_density, potential, potential_range=None, min_points=5):
+    """
+    Fits the linear region of the Tafel plot (potential over log10 of the current
+    density). All windows of consecutive points are fitted at once with least
+    squares computed from cumulative sums. The window with the best R² is chosen;
+    among windows within `TAFEL_R_SQUARED_TOLERANCE` of the best one, the longest
+    wins.
+
+    `potential_range` optionally restricts the fit to `(min, max)` in the unit of
+    `potential`. Returns a dict with `slope` (in units of potential per decade),
+    `intercept`, `r_squared`, `start` and `stop` (the log10 current density
+    range of the fit), or None if there are not enough points.
+    """
+    current_density = np.abs(np.asarray(current_density, dtype=float))
+    potential = np.asarray(potential, dtype=float)
+    mask = np.isfinite(potential) & np.isfinite(current_density) & (current_density > 0)
+    if potential_range is not None:
+        mask &= (potential >= potential_range[0]) & (potential <= potential_range[1])
+    x = np.log10(current_density[mask])
+    y = potential[mask]
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    num_points = len(x)
+    if num_points < 3:
+        return None
+
+    min_points = min(max(min_points, 3), num_points)
+    sizes = np.unique(
+        np.linspace(min_points, num_points, TAFEL_NUM_WINDOW_SIZES).astype(int)
+    )
+    starts = np.arange(num_points)[:, None]
+    ends = starts + sizes[None, :]
+    valid = ends <= num_points
+    starts = np.broadcast_to(starts, ends.shape)[valid]
+    ends = ends[valid]
+    n = (ends - starts).astype(float)
+
+    sum_x = _window_sums(x, starts, ends)
+    sum_y = _window_sums(y, starts, ends)
+    sum_xx = _window_sums(x * x, starts, ends)
+    sum_xy = _window_sums(x * y, starts, ends)
+    sum_yy = _window_sums(y * y, starts, ends)
+    var_x = n * sum_xx - sum_x**2
+    var_y = n * sum_yy - sum_y**2
+    cov_xy = n * sum_xy - sum_x * sum_y
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = cov_xy / var_x
+        r_squared = cov_xy**2 / (var_x * var_y)
+    r_squared = np.where(np.isfinite(r_squared), r_squared, -np.inf)
+    if not np.isfinite(r_squared.max()):
+        return None
+
+    candidates = np.flatnonzero(
+        r_squared >= r_squared.max() - TAFEL_R_SQUARED_TOLERANCE
+    )
+    best = candidates[np.argmax(n[candidates])]
+    intercept = (sum_y[best] - slope[best] * sum_x[best]) / n[best]
+    return {
+        'slope': slope[best],
+        'intercept': intercept,
+        'r_squared': r_squared[best],
+        'start': x[starts[best]],
+        'stop': x[ends[best] - 1],
+    }
@@ -0,0 +1,138 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+TIME_BUCKET_MAX_POINTS = 10_000
+
+
+def get_bucket_size(seconds, max_points=TIME_BUCKET_MAX_POINTS):
+    """
+    Returns the bucket size in seconds that reduces the series to at most about
+    `max_points` buckets, or None if it already has fewer points.
+    """
+    seconds = np.asarray(seconds, dtype=float)
+    seconds = seconds[np.isfinite(seconds)]
+    if len(seconds) <= max_points:
+        return None
+    return get_range_bucket_size(len(seconds), seconds.min(), seconds.max(), max_points)
+
+
+def get_range_bucket_size(num_points, start, stop, max_points=TIME_BUCKET_MAX_POINTS):
+    """
+    Returns the bucket size in seconds that reduces `num_points` points between
+    `start` and `stop` seconds to at most about `max_points` buckets, or None if
+    there are fewer points already.
+    """
+    duration = stop - start
+    if num_points <= max_points or not duration > 0:
+        return None
+    return math.ceil(duration / max_points)
+
+
+def get_epoch_seconds(datetimes):
+    """
+    Returns the seconds since the epoch of a series of datetimes, with NaN for
+    missing ones.
+    """
+    datetimes = pd.to_datetime(pd.Series(datetimes))
+    return ((datetimes - pd.Timestamp(0)).dt.total_seconds()).to_numpy(dtype=float)
+
+
+def aggregate_buckets(data, buckets, aggregation='mean', keep=()):
+    """
+    Aggregates all numeric columns of `data` with `aggregation` ('mean', 'min' or
+    'max') over the rows with the same bucket number. Non-numeric columns and the
+    columns in `keep`, e.g. time columns, take the first value of every bucket.
+    """
+    functions = {
+        column: aggregation
+        if column not in keep and pd.api.types.is_numeric_dtype(data[column])
+        else 'first'
+        for column in data.columns
+    }
+    return data.groupby(buckets, sort=True).agg(functions).reset_index(drop=True)
+
+
+def aggregate_time_buckets(data, seconds, bucket_size, aggregation='mean', keep=()):
+    """
+    Aggregates `data` like `aggregate_buckets` over buckets of `bucket_size`
+    seconds, starting at the first time. Rows without a time are dropped.
+    """
+    seconds = np.asarray(seconds, dtype=float)
+    valid = np.isfinite(seconds)
+    data = data[valid]
+    seconds = seconds[valid]
+    if len(seconds) == 0:
+        return data
+    buckets = np.floor((seconds - seconds.min()) / bucket_size).astype(int)
+    return aggregate_buckets(data, buckets, aggregation, keep)
+
+
+class TimeBucketAggregator:
+    """
+    Aggregates a series chunk by chunk into the same buckets as
+    `aggregate_time_buckets`. The rows of the last bucket of every chunk are held
+    back until the next chunk, so buckets spanning two chunks are aggregated as a
+    whole, as long as the times increase.
+    """
+
+    def __init__(self, bucket_size, aggregation='mean', keep=()):
+        self.bucket_size = bucket_size
+        self.aggregation = aggregation
+        self.keep = keep
+        self.origin = None
+        self._buckets = []
+        self._pending = None
+
+    def _aggregate(self, data, buckets):
+        self._buckets.append(
+            aggregate_buckets(data, buckets, self.aggregation, self.keep)
+        )
+
+    def add(self, data, seconds):
+        seconds = np.asarray(seconds, dtype=float)
+        if self._pending is not None:
+            data = pd.concat([self._pending[0], data], ignore_index=True)
+            seconds = np.concatenate([self._pending[1], seconds])
+        valid = np.isfinite(seconds)
+        data = data[valid]
+        seconds = seconds[valid]
+        self._pending = (data, seconds)
+        if len(seconds) == 0:
+            return
+        if self.origin is None:
+            self.origin = seconds.min()
+        buckets = self.get_buckets(seconds)
+        last_bucket = buckets == buckets[-1]
+        self._pending = (data[last_bucket], seconds[last_bucket])
+        if not last_bucket.all():
+            self._aggregate(data[~last_bucket], buckets[~last_bucket])
+
+    def get_buckets(self, seconds):
+        return np.floor((seconds - self.origin) / self.bucket_size).astype(int)
+
+    def finish(self):
+        """
+        Returns the aggregated series of all chunks added so far.
+        """
+        if self._pending is not None and len(self._pending[1]):
+            data, seconds = self._pending
+            self._aggregate(data, self.get_buckets(seconds))
+        if not self._buckets:
+            return self._pending[0] if self._pending is not None else pd.DataFrame()
+        return pd.concat(self._buckets, ignore_index=True)
+
+
+def get_array_columns(data):
+    """
+    Returns the numeric and datetime columns of `data` as arrays, e.g. to store the
+    full resolution of a series next to its aggregated version.
+    """
+    return {
+        str(column): data[column].to_numpy()
+        for column in data.columns
+        if pd.api.types.is_numeric_dtype(data[column])
+        or pd.api.types.is_datetime64_any_dtype(data[column])
+        or pd.api.types.is_timedelta64_dtype(data[column])
+    }
@@ -1,5 +1,11 @@
+import numpy as np
 from nomad.client import normalize_all, parse
 
+from nomad_chemical_energy.schema_packages.utilities.decimation import (
+    minmax_decimation_indices,
+    nearest_indices,
+)
+
 
 def test_recipe_entry_hash():
     """
@@ -27,3 +33,19 @@ def test_recipe_entry_hash():
     assert recipe1_archive.data.entry_dict_hash == recipe2_archive.data.entry_dict_hash
     assert recipe1_archive.data.entry_dict_hash != recipe3_archive.data.entry_dict_hash
     assert recipe2_archive.data.entry_dict_hash != recipe3_archive.data.entry_dict_hash
+
+
+def test_minmax_decimation_keeps_extrema_and_injections():
+    """
+    Test that the figure decimation keeps global extrema and GC injection points.
+    """
+    values = np.sin(np.arange(100000) / 500)
+    values[12345] = 5
+    values[54321] = -5
+    keep = nearest_indices(np.arange(100000) * 10, [25003, 700000])
+
+    indices = minmax_decimation_indices(values, 1000, keep_indices=keep)
+
+    assert len(indices) <= 1000 + len(keep)
+    assert {0, 99999, 2500, 70000, 12345, 54321}.issubset(indices)
+    assert len(minmax_decimation_indices(values[:10], 1000)) == 10
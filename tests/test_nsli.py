@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import nomad.search
+from nomad.search import validate_quantity
+
+from nomad_chemical_energy.schema_packages import ce_nsli_package
+from nomad_chemical_energy.schema_packages.ce_nsli_package import (
+    PROCESS_SEARCH_REQUIRED,
+    REFERENCING_STATE_REQUIRED,
+    get_processes,
+)
+
+
+def test_process_search_quantities_are_valid():
+    for quantity in PROCESS_SEARCH_REQUIRED + REFERENCING_STATE_REQUIRED:
+        validate_quantity(quantity)
+
+
+def get_referencing_entry(entry_id, lab_ids, names):
+    return dict(
+        entry_id=entry_id,
+        entry_name=f'{entry_id}.archive.json',
+        results=dict(eln=dict(lab_ids=lab_ids, names=names)),
+    )
+
+
+PROCESS_PAGES = {
+    None: (
+        [
+            get_referencing_entry('b', ['MX1_spin2', 'SUB1'], ['Spin 2', 'Substrate']),
+            # the sample section comes first and the names are not aligned
+            get_referencing_entry('c', ['SUB2', 'MX1_drop1'], ['Drop 1']),
+        ],
+        'page2',
+    ),
+    'page2': (
+        [
+            get_referencing_entry('a', ['MX1_spin1'], ['Spin 1']),
+            get_referencing_entry('d', ['MX2_spin1'], ['Other solution']),
+        ],
+        None,
+    ),
+}
+
+
+def test_get_processes_pages_and_caches(monkeypatch):
+    monkeypatch.setattr(ce_nsli_package, '_process_cache', OrderedDict())
+    state = dict(total=4, complete_time='2024-01-01T00:00:00')
+    process_pages = []
+
+    def search(owner, query, pagination, required, user_id):
+        assert query == {'entry_references.target_entry_id': 'solution'}
+        if 'complete_time' in required.include:
+            data = [dict(entry_id='a', complete_time=state['complete_time'])]
+            return SimpleNamespace(
+                data=data,
+                pagination=SimpleNamespace(
+                    total=state['total'], next_page_after_value=None
+                ),
+            )
+        process_pages.append(pagination.page_after_value)
+        data, next_page = PROCESS_PAGES[pagination.page_after_value]
+        return SimpleNamespace(
+            data=data,
+            pagination=SimpleNamespace(
+                total=len(data), next_page_after_value=next_page
+            ),
+        )
+
+    monkeypatch.setattr(nomad.search, 'search', search)
+    archive = SimpleNamespace(
+        metadata=SimpleNamespace(main_author=SimpleNamespace(user_id='user'))
+    )
+
+    expected = [
+        ('MX1_drop1', 'c.archive.json'),
+        ('MX1_spin1', 'Spin 1'),
+        ('MX1_spin2', 'Spin 2'),
+    ]
+    assert get_processes(archive, 'solution', 'MX1') == expected
+    assert process_pages == [None, 'page2']
+
+    # unchanged referencing entries are served from the cache
+    assert get_processes(archive, 'solution', 'MX1') == expected
+    assert process_pages == [None, 'page2']
+
+    # a reprocessed referencing entry invalidates the cache
+    state['complete_time'] = '2024-01-02T00:00:00'
+    assert get_processes(archive, 'solution', 'MX1') == expected
+    assert process_pages == [None, 'page2', None, 'page2']
+
+    # so does a new referencing entry
+    state['total'] = 5
+    get_processes(archive, 'solution', 'MX1')
+    assert process_pages == [None, 'page2', None, 'page2', None, 'page2']
@@ -1,9 +1,40 @@
+import io
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
 from nomad.client import normalize_all, parse
 
+from nomad_chemical_energy.schema_packages.file_parser.excel_workbook import (
+    get_xlsx_sheet_names,
+)
+from nomad_chemical_energy.schema_packages.file_parser.pfo_parser import (
+    get_pfo_datetimes,
+    get_pfo_measurement_csv,
+    get_pfo_seconds,
+)
+from nomad_chemical_energy.schema_packages.file_parser.sensor_log_parser import (
+    iter_sensor_log,
+)
+from nomad_chemical_energy.schema_packages.utilities.batched_arrays import (
+    batch_interp,
+    batch_trapezoid,
+)
+from nomad_chemical_energy.schema_packages.utilities.image_pyramid import (
+    downscale,
+    get_pyramid_levels,
+    iter_tiles,
+    to_uint8,
+)
+from nomad_chemical_energy.schema_packages.utilities.tafel import fit_tafel_slope
+from nomad_chemical_energy.schema_packages.utilities.time_buckets import (
+    TimeBucketAggregator,
+    aggregate_time_buckets,
+    get_bucket_size,
+    get_epoch_seconds,
+)
+
 
 @pytest.fixture(
     params=[
@@ -445,3 +476,137 @@ def test_necc_ecgc_excel():
         '2025-12-17 12:59:10+0000', tz='UTC'
     )
     assert archive.data.ph.ph_value[0] == 11.514
+
+
+def test_batched_oer_metrics():
+    xs = [np.linspace(0, 1, 11), np.array([0.5]), np.array([]), np.linspace(1, 3, 5)]
+    ys = [x**2 for x in xs]
+    integrals = batch_trapezoid(ys, xs)
+    assert np.allclose(integrals[[0, 1, 3]], [0.335, 0, 8.75])
+    assert integrals[2] == 0
+    for x in (-1, 0.55, 2, 5):
+        values = batch_interp(x, xs, ys)
+        assert np.allclose(
+            values[[0, 1, 3]], [np.interp(x, xs[i], ys[i]) for i in (0, 1, 3)]
+        )
+        assert np.isnan(values[2])
+
+
+def test_batched_interp_non_monotonic():
+    # a noisy LSV trace whose current density is not monotonic
+    current_density = np.array([0.0, 4.0, 3.0, 8.0, 12.0, 11.0, 15.0])
+    overpotential = np.linspace(0.2, 0.5, len(current_density))
+    order = np.argsort(current_density, kind='stable')
+    for x in (-1, 3.5, 10, 11.5, 20):
+        value = batch_interp(x, [current_density], [overpotential])[0]
+        assert np.isclose(
+            value, np.interp(x, current_density[order], overpotential[order])
+        )
+
+
+def test_tafel_slope_fit():
+    current_density = np.logspace(-2, 2, 400)
+    potential = np.where(
+        current_density > 1,
+        1.45 + 0.06 * np.log10(current_density),
+        1.45 + 0.2 * np.log10(current_density),
+    )
+    tafel_fit = fit_tafel_slope(current_density, potential, potential_range=(1.5, 1.53))
+    assert round(tafel_fit['slope'] * 1000, 3) == 60
+    assert round(tafel_fit['intercept'], 6) == 1.45
+    assert tafel_fit['r_squared'] > 0.9999
+    assert fit_tafel_slope([1, 2], [1.5, 1.51]) is None
+
+
+def test_tif_tile_pyramid():
+    image = np.arange(1000 * 600, dtype=np.uint16).reshape(1000, 600)
+    base = to_uint8(downscale(image, 512))
+    assert base.shape == (500, 300)
+    assert base.dtype == np.uint8
+    levels = get_pyramid_levels(base, tile_size=128)
+    assert [level.shape for level in levels] == [(125, 75), (250, 150), (500, 300)]
+    tiles = list(iter_tiles(levels[-1], tile_size=128))
+    assert len(tiles) == 4 * 3
+    assert sum(tile.size for _, _, tile in tiles) == base.size
+
+
+def test_sensor_log_time_buckets():
+    rows = ''.join(
+        f'01/02/2024;10:{i // 60:02d}:{i % 60:02d};{i}\n' for i in range(120)
+    )
+    file_obj = io.StringIO(
+        'Device\n\n"Date [mm/dd/yyyy]";"Time [hh:mm:ss]";"Oxygen [%O2]"\n' + rows
+    )
+    data = get_pfo_measurement_csv(file_obj)
+    assert data.shape == (120, 3)
+    seconds = get_pfo_seconds(data)
+    assert seconds[-1] == 119
+    assert get_bucket_size(seconds, max_points=1000) is None
+    bucket_size = get_bucket_size(seconds, max_points=12)
+    assert bucket_size == 10
+    aggregated = aggregate_time_buckets(data, seconds, bucket_size, 'max')
+    assert len(aggregated) == 12
+    assert aggregated['Oxygen [%O2]'].tolist() == list(range(9, 120, 10))
+    assert aggregated['Time [hh:mm:ss]'][1] == '10:00:10'
+
+
+def test_sensor_log_chunked_time_buckets():
+    rows = ''.join(
+        f'01/02/2024;10:{i // 60:02d}:{i % 60:02d};{"x" if i == 50 else i}\n'
+        for i in range(120)
+    )
+    text = '"Date [mm/dd/yyyy]";"Time [hh:mm:ss]";"Oxygen [%O2]"\n' + rows
+    data = get_pfo_measurement_csv(io.StringIO(text))
+    expected = aggregate_time_buckets(data, get_pfo_seconds(data), 10, 'max')
+
+    aggregator = TimeBucketAggregator(10, 'max')
+    for chunk in iter_sensor_log(io.StringIO(text), chunk_size=7):
+        aggregator.add(chunk, get_epoch_seconds(get_pfo_datetimes(chunk)))
+    pd.testing.assert_frame_equal(aggregator.finish(), expected)
+
+
+def test_sensor_log_coerced_values_are_logged():
+    class Logger:
+        def __init__(self):
+            self.warnings = []
+
+        def warning(self, event, **kwargs):
+            self.warnings.append((event, kwargs))
+
+    # the invalid value comes after the rows the column types are inferred from
+    text = 'index;value\n' + ''.join(
+        f'{i};{"x" if i == 1500 else i}\n' for i in range(2000)
+    )
+    logger = Logger()
+    data = pd.concat(iter_sensor_log(io.StringIO(text), chunk_size=300, logger=logger))
+    assert data['value'].dtype == 'float64'
+    assert data['value'].isna().sum() == 1
+    assert [kwargs for _, kwargs in logger.warnings] == [
+        {'coerced_values': {'value': 1}}
+    ]
+
+
+def test_pfo_csv_without_header():
+    with pytest.raises(ValueError, match='Date'):
+        get_pfo_measurement_csv(io.StringIO('Device\n1;2;3\n'))
+
+
+def test_xlsx_sheet_names_from_relationships(tmp_path):
+    import zipfile
+
+    file_name = tmp_path / 'workbook.xlsx'
+    with pd.ExcelWriter(file_name) as writer:
+        pd.DataFrame({'a': [1]}).to_excel(writer, sheet_name='first')
+        pd.DataFrame({'a': [2]}).to_excel(writer, sheet_name='second')
+    assert get_xlsx_sheet_names(str(file_name)) == ('first', 'second')
+
+    # the workbook part does not have to be xl/workbook.xml
+    moved_file_name = tmp_path / 'moved.xlsx'
+    with (
+        zipfile.ZipFile(file_name) as source,
+        zipfile.ZipFile(moved_file_name, 'w') as target,
+    ):
+        for name in source.namelist():
+            content = source.read(name).replace(b'xl/workbook.xml', b'xl/book.xml')
+            target.writestr(name.replace('xl/workbook.xml', 'xl/book.xml'), content)
+    assert get_xlsx_sheet_names(str(moved_file_name)) == ('first', 'second')
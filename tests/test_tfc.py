@@ -0,0 +1,111 @@
+import io
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from baseclasses.characterizations import (
+    XRFComposition,
+    XRFLayer,
+    XRFSingleLibraryMeasurement,
+)
+
+from nomad_chemical_energy.schema_packages.tfc_package import (
+    TFC_XRFLibrary,
+    get_element_symbol,
+    is_atomic_percent,
+)
+
+
+class RawFilesContext:
+    def __init__(self):
+        self.files = {}
+        self.processed = []
+
+    def raw_path_exists(self, path):
+        return path in self.files
+
+    @contextmanager
+    def raw_file(self, path, mode='r'):
+        buffer = io.StringIO()
+        yield buffer
+        self.files[path] = buffer.getvalue()
+
+    def process_updated_raw_file(self, path, allow_modify=False):
+        self.processed.append(path)
+
+
+class Logger:
+    def info(self, *args, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize(
+    'name, element, atomic',
+    [
+        ('Ti At%', 'Ti', True),
+        ('Ti Mass%', 'Ti', False),
+        ('At% Co', 'Co', True),
+        ('Layer Ti', 'Ti', False),
+        ('Pt at.%', 'Pt', True),
+        ('Thickness', None, False),
+    ],
+)
+def test_xrf_composition_names(name, element, atomic):
+    assert get_element_symbol(name) == element
+    assert is_atomic_percent(name) == atomic
+
+
+def get_xrf_measurement(x, y, ti_fraction):
+    return XRFSingleLibraryMeasurement(
+        position_x=x,
+        position_y=y,
+        layer=[
+            XRFLayer(layer='Substrate'),
+            XRFLayer(
+                layer='Layer 1',
+                thickness=100,
+                composition=[
+                    XRFComposition(name='Ti At%', amount=100 * ti_fraction),
+                    XRFComposition(name='Co At%', amount=100 * (1 - ti_fraction)),
+                    # mass percentages must not be added to the atomic fractions
+                    XRFComposition(name='Ti Mass%', amount=40),
+                    XRFComposition(name='Co Mass%', amount=60),
+                ],
+            ),
+        ],
+    )
+
+
+def test_xy_samples_created_in_bulk_and_once():
+    library = TFC_XRFLibrary(
+        data_folder='LIB01_xrf',
+        measurements=[
+            get_xrf_measurement(1.0, 2.0, 0.25),
+            get_xrf_measurement(3.0, 4.0, 0.5),
+            get_xrf_measurement(None, 4.0, 0.5),
+        ],
+    )
+    context = RawFilesContext()
+    archive = SimpleNamespace(m_context=context)
+
+    library.create_xy_sample_entries(archive, Logger())
+    assert len(context.files) == 2
+    assert sorted(context.processed) == sorted(context.files)
+    samples = {
+        (data['position']['x'], data['position']['y']): data
+        for data in (json.loads(content)['data'] for content in context.files.values())
+    }
+    assert set(samples) == {(1.0, 2.0), (3.0, 4.0)}
+    sample = samples[(1.0, 2.0)]
+    assert sample['lab_id'].startswith('LIB01_')
+    assert {
+        composition['element']: composition['atomic_fraction']
+        for composition in sample['elemental_composition']
+    } == pytest.approx({'Ti': 0.25, 'Co': 0.75})
+
+    # positions that already have a sample are skipped on a re-run
+    files = dict(context.files)
+    library.create_xy_sample_entries(archive, Logger())
+    assert context.files == files
+    assert len(context.processed) == 2